@@ -0,0 +1,234 @@
+"""
+A version of the data file of all languages (see multilang), stored as its differences from a base version:
+
+    {
+        "version": ...,
+        "base": base version,
+        "base_file": data file of the base version, in the same directory,
+        "languages": [{"lang_code": ..., "language": ...}, ...],
+        "fish": {"set": {fish_id: {field: value}}, "removed": [fish_id, ...], "order": [fish_id, ...]},
+        "strings": {language: {table: {"set": {key: name}, "removed": [key, ...]}}},
+    }
+
+Added fish have every field in "set", changed fish only the fields that changed,
+such as their locations, bundles or gifts.
+"order" is only there if the fish are not in the order of the base (without removed fish) followed by added fish.
+Empty "set", "removed" and tables are left out.
+"""
+import json
+import os
+import threading
+import typing
+from collections import OrderedDict
+
+import multilang
+
+SET = 'set'
+REMOVED = 'removed'
+ORDER = 'order'
+
+# materialized versions kept in memory by `load`
+CACHE_SIZE = 16
+
+# absolute path -> (key, materialized version), least recently used first
+_cache: OrderedDict[str, tuple[tuple, dict]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def file_name(game_version: str) -> str:
+    return f'{game_version} (delta).json'
+
+
+def is_delta(data: typing.Mapping) -> bool:
+    return 'base' in data
+
+
+def _diff_mapping(base: typing.Mapping, target: typing.Mapping) -> dict:
+    changes = {}
+    set_ = {key: value for key, value in target.items() if key not in base or base[key] != value}
+    if set_:
+        changes[SET] = set_
+    removed = [key for key in base if key not in target]
+    if removed:
+        changes[REMOVED] = removed
+    return changes
+
+
+def _apply_mapping(base: typing.Mapping, changes: typing.Mapping) -> dict:
+    result = dict(base)
+    for key in changes.get(REMOVED, ()):
+        del result[key]
+    result.update(changes.get(SET, {}))
+    return result
+
+
+def _diff_fish(base: typing.Mapping, target: typing.Mapping) -> dict:
+    changes = {}
+    set_ = {}
+    for fish_id, fish in target.items():
+        base_fish = base.get(fish_id)
+        if base_fish is None:
+            set_[fish_id] = fish
+            continue
+        if base_fish.keys() != fish.keys():
+            raise ValueError(f'Fish {fish_id} has different fields than in the base version')
+        fields = {key: value for key, value in fish.items() if base_fish[key] != value}
+        if fields:
+            set_[fish_id] = fields
+    if set_:
+        changes[SET] = set_
+
+    removed = [fish_id for fish_id in base if fish_id not in target]
+    if removed:
+        changes[REMOVED] = removed
+
+    if list(_apply_fish(base, changes)) != list(target):
+        changes[ORDER] = list(target)
+    return changes
+
+
+def _apply_fish(base: typing.Mapping, changes: typing.Mapping) -> dict:
+    set_ = changes.get(SET, {})
+    removed = set(changes.get(REMOVED, ()))
+
+    result = {}
+    for fish_id, fish in base.items():
+        if fish_id in removed:
+            continue
+        fields = set_.get(fish_id)
+        result[fish_id] = fish if fields is None else {**fish, **fields}
+    for fish_id, fish in set_.items():
+        if fish_id not in base:
+            result[fish_id] = fish
+
+    order = changes.get(ORDER)
+    if order is not None:
+        result = {fish_id: result[fish_id] for fish_id in order}
+    return result
+
+
+def diff(base: typing.Mapping, target: typing.Mapping, base_file: str) -> dict:
+    """Both are data files of all languages; `base_file` is the file name of `base`."""
+    strings = {}
+    for language, tables in target['strings'].items():
+        base_tables = base['strings'].get(language, {})
+        language_changes = {}
+        for table, names in tables.items():
+            changes = _diff_mapping(base_tables.get(table, {}), names)
+            if changes:
+                language_changes[table] = changes
+        strings[language] = language_changes
+
+    return {
+        'version': target['version'],
+        'base': base['version'],
+        'base_file': base_file,
+        'languages': target['languages'],
+        multilang.FISH: _diff_fish(base['core'][multilang.FISH], target['core'][multilang.FISH]),
+        'strings': strings,
+    }
+
+
+def apply(base: typing.Mapping, delta: typing.Mapping) -> dict:
+    """
+    Returns the data file of all languages of the version of `delta`.
+    Fish that did not change are shared with `base`.
+    """
+    strings = {}
+    for language, changes in delta['strings'].items():
+        base_tables = base['strings'].get(language, {})
+        strings[language] = {
+            table: _apply_mapping(base_tables.get(table, {}), changes.get(table, {}))
+            for table in (multilang.FISH, multilang.LOCATIONS, multilang.BUNDLES, multilang.CHARACTERS)
+        }
+
+    return {
+        'version': delta['version'],
+        'languages': delta['languages'],
+        'core': {multilang.FISH: _apply_fish(base['core'][multilang.FISH], delta[multilang.FISH])},
+        'strings': strings,
+    }
+
+
+def _stamp(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load(path: str, data: typing.Mapping | None) -> tuple[tuple, dict]:
+    """
+    (key, materialized version) of an absolute path.
+    The key is made of the stamps of the file and of its base, so it changes whenever either does.
+    """
+    stamp = _stamp(path)
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None:
+            _cache.move_to_end(path)
+    if cached is not None:
+        (cached_stamp, base_path, base_key), _ = cached
+        if cached_stamp == stamp and (base_path is None or _load(base_path, None)[0] == base_key):
+            return cached
+
+    if data is None:
+        with open(path) as f:
+            data = json.load(f)
+    if is_delta(data):
+        base_path = os.path.join(os.path.dirname(path), data['base_file'])
+        base_key, base = _load(base_path, None)
+        result = (stamp, base_path, base_key), apply(base, data)
+    else:
+        result = (stamp, None, None), data
+
+    with _lock:
+        _cache[path] = result
+        _cache.move_to_end(path)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def load(path: str, data: typing.Mapping = None) -> dict:
+    """
+    Reads a data file of all languages, materializing it from its base if it is a delta.
+    `data` is the decoded file, if the caller has read it already.
+    Results are cached until the file or its base changes, and must not be modified.
+    """
+    return _load(os.path.abspath(path), data)[1]
+
+
+def cache_clear() -> None:
+    with _lock:
+        _cache.clear()
+
+
+def write(path: str, base: typing.Mapping, target: typing.Mapping, base_file: str) -> dict:
+    delta = diff(base, target, base_file)
+    if apply(base, delta) != target:
+        raise ValueError(f"{target['version']} cannot be stored as a delta of {base['version']}")
+    with open(path, 'w') as f:
+        json.dump(delta, f)
+    return delta
+
+
+def main(args=None):
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description='Store the data file of all languages of a version as a delta of another.')
+    parser.add_argument('base_file')
+    parser.add_argument('target_file')
+    args = parser.parse_args(args)
+
+    base = load(args.base_file)
+    target = load(args.target_file)
+    output_dir = os.path.dirname(args.target_file)
+    write(
+        os.path.join(output_dir, file_name(target['version'])),
+        base,
+        target,
+        os.path.relpath(args.base_file, output_dir),
+    )
+
+
+if __name__ == '__main__':
+    main()
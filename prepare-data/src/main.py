@@ -1,6 +1,9 @@
 import json
 import os
 
+import delta
+import multilang
+import snapshot
 import utils
 from processors import process
 
@@ -13,19 +16,60 @@ def get_game_version(game_dir):
     return version
 
 
-def update_index(output, game_version, processed_files):
-    index_file = os.path.join(output, 'index.json')
+def load_index(output):
     try:
-        with open(index_file) as f:
-            index_data = json.load(f)
+        with open(os.path.join(output, 'index.json')) as f:
+            return json.load(f)
     except FileNotFoundError:
-        index_data = {'versions': []}
+        return {'versions': []}
+
+
+def store_delta(output, game_version, base_version, processed_files):
+    """
+    Replaces the data files of a version with a delta of the data file of all languages of another version,
+    which must not be a delta itself.
+    """
+    index_data = load_index(output)
+    if base_version in index_data.get('deltas', {}):
+        raise ValueError(f'{base_version} is stored as a delta and cannot be a base')
+    try:
+        base_file = index_data['all_languages'][base_version]
+    except KeyError:
+        raise ValueError(f'{base_version} has no data file of all languages') from None
+
+    all_languages_file = os.path.join(output, multilang.file_name(game_version))
+    delta_file = delta.file_name(game_version)
+    delta.write(
+        os.path.join(output, delta_file),
+        delta.load(os.path.join(output, base_file)),
+        delta.load(all_languages_file),
+        base_file,
+    )
+
+    for file_name in processed_files:
+        os.remove(os.path.join(output, file_name))
+        os.remove(os.path.join(output, snapshot.file_name(file_name)))
+    os.remove(all_languages_file)
+    return delta_file
+
+
+def update_index(output, game_version, processed_files, delta_file=None):
+    index_file = os.path.join(output, 'index.json')
+    index_data = load_index(output)
 
     if game_version not in index_data['versions']:
         index_data['versions'].append(game_version)
         index_data['versions'].sort(key=utils.game_version_sort_key, reverse=True)
 
-    index_data[game_version] = processed_files
+    if delta_file is None:
+        index_data[game_version] = processed_files
+        index_data.setdefault('all_languages', {})[game_version] = multilang.file_name(game_version)
+        index_data.get('deltas', {}).pop(game_version, None)
+    else:
+        # no data file of a single language
+        index_data[game_version] = []
+        index_data.get('all_languages', {}).pop(game_version, None)
+        index_data.setdefault('deltas', {})[game_version] = delta_file
 
     with open(index_file, 'w') as f:
         json.dump(index_data, f)
@@ -37,11 +81,26 @@ def main(args=None):
     parser.add_argument('--game-dir', default='/game')
     parser.add_argument('--game-data-dir', default='/game/Content (unpacked)')
     parser.add_argument('--output', default='/output')
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help='Number of languages processed in parallel, each in its own process. Default: 1',
+    )
+    parser.add_argument(
+        '--force', '-f', action='store_true',
+        help='Rebuild every language, even if its source files and the code did not change.',
+    )
+    parser.add_argument(
+        '--delta-base', default=None, metavar='VERSION',
+        help='Store this version as a delta of VERSION, instead of complete data files.',
+    )
     args = parser.parse_args(args)
 
     game_version = get_game_version(args.game_dir)
-    processed_files = process(args.game_data_dir, args.output, game_version)
-    update_index(args.output, game_version, processed_files)
+    processed_files = process(args.game_data_dir, args.output, game_version, jobs=args.jobs, force=args.force)
+    delta_file = None
+    if args.delta_base is not None:
+        delta_file = store_delta(args.output, game_version, args.delta_base, processed_files)
+    update_index(args.output, game_version, processed_files, delta_file)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,201 @@
+"""
+One data file for every language.
+
+The language-independent fish/location/bundle/gift graph is stored once as "core",
+and every language only adds a table of names:
+
+    {
+        "version": ...,
+        "languages": [{"lang_code": ..., "language": ...}, ...],
+        "core": {"fish": {fish_id: fish without any "name"}},
+        "strings": {
+            language: {
+                "fish": {fish_id: name},
+                "locations": {"key/variation": name},
+                "bundles": {en_name: name},
+                "characters": {key: name},
+            },
+        },
+    }
+"""
+import typing
+from functools import cached_property
+
+from returns import returns
+
+FISH = 'fish'
+LOCATIONS = 'locations'
+BUNDLES = 'bundles'
+CHARACTERS = 'characters'
+
+
+def file_name(game_version: str) -> str:
+    return f'{game_version} (all languages).json'
+
+
+def is_multi_language(data: typing.Mapping) -> bool:
+    return 'core' in data
+
+
+def location_key(location: typing.Mapping) -> str:
+    return f"{location['key']}/{location['variation']}"
+
+
+@returns(dict)
+def _without_name(item: typing.Mapping) -> dict:
+    for key, value in item.items():
+        if key == 'name':
+            continue
+        yield key, value
+
+
+def _core_fish(fish: typing.Mapping) -> dict:
+    core = _without_name(fish)
+    if fish['locations'] is not None:
+        core['locations'] = [_without_name(location) for location in fish['locations']]
+    if fish['bundles'] is not None:
+        core['bundles'] = [_without_name(bundle) for bundle in fish['bundles']]
+    if fish['gifts'] is not None:
+        core['gifts'] = {
+            preference_type: [_without_name(character) for character in characters]
+            for preference_type, characters in fish['gifts'].items()
+        }
+    return core
+
+
+def _strings(result: typing.Mapping) -> dict[str, dict[str, str]]:
+    strings = {FISH: {}, LOCATIONS: {}, BUNDLES: {}, CHARACTERS: {}}
+    for fish_id, fish in result['fish'].items():
+        strings[FISH][fish_id] = fish['name']
+        for location in fish['locations'] or ():
+            strings[LOCATIONS][location_key(location)] = location['name']
+        for bundle in fish['bundles'] or ():
+            strings[BUNDLES][bundle['en_name']] = bundle['name']
+        for characters in (fish['gifts'] or {}).values():
+            for character in characters:
+                strings[CHARACTERS][character['key']] = character['name']
+    return strings
+
+
+def build(results: typing.Iterable[typing.Mapping]) -> dict:
+    """
+    Combines the results of every language, which must only differ in names.
+    Only the core of the first result and the names of every result are kept,
+    so results can be read one at a time, see read_results.
+    """
+    first = None
+    core = None
+    languages = []
+    strings = {}
+    for result in results:
+        result_core = {
+            fish_id: _core_fish(fish)
+            for fish_id, fish in result['fish'].items()
+        }
+        if core is None:
+            first = {'version': result['version'], 'language': result['language']}
+            core = result_core
+        elif result_core != core:
+            raise ValueError(f"{result['language']} differs from {first['language']} in more than names")
+        languages.append({'lang_code': result['lang_code'], 'language': result['language']})
+        strings[result['language']] = _strings(result)
+
+    return {
+        'version': first['version'],
+        'languages': languages,
+        'core': {FISH: core},
+        'strings': strings,
+    }
+
+
+def read_results(json_files: typing.Iterable[str]) -> typing.Iterator[dict]:
+    """The data file of every language, read when the previous one is no longer needed."""
+    import json
+
+    for json_file in json_files:
+        with open(json_file) as f:
+            yield json.load(f)
+
+
+class StringTable:
+    """
+    Resolves the names of one language.
+    """
+
+    def __init__(self, strings: typing.Mapping[str, typing.Mapping[str, str]]):
+        self._strings = strings
+
+    def fish(self, fish: typing.Mapping) -> str:
+        return self._strings[FISH][fish['id']]
+
+    def location(self, location: typing.Mapping) -> str:
+        return self._strings[LOCATIONS][location_key(location)]
+
+    def bundle(self, bundle: typing.Mapping) -> str:
+        return self._strings[BUNDLES][bundle['en_name']]
+
+    def character(self, character: typing.Mapping) -> str:
+        return self._strings[CHARACTERS][character['key']]
+
+
+class MultiLanguageData:
+    def __init__(self, data: typing.Mapping):
+        self._data = data
+
+    @cached_property
+    @returns(dict)
+    def _languages(self) -> dict[str, dict]:
+        """Language name or code -> language"""
+        for language in self._data['languages']:
+            yield language['language'], language
+            if language['lang_code'] is not None:
+                yield language['lang_code'], language
+
+    @property
+    def languages(self) -> list[dict]:
+        return self._data['languages']
+
+    def __getitem__(self, language: str | None) -> dict:
+        """
+        Returns the same keys as the data file of a single language,
+        except that names are in "strings" instead of in "fish".
+        `None` is English, or the first language if there is no English.
+        """
+        if language is None:
+            language = next(
+                (language for language in self.languages if language['lang_code'] is None),
+                self.languages[0],
+            )
+        else:
+            language = self._languages[language]
+
+        return {
+            'version': self._data['version'],
+            'lang_code': language['lang_code'],
+            'language': language['language'],
+            'fish': self._data['core'][FISH],
+            'strings': self._data['strings'][language['language']],
+        }
+
+
+def main(args=None):
+    import json
+    import os
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description='Combine the JSON data files of every language of a version.')
+    parser.add_argument('json_files', nargs='+')
+    parser.add_argument('--output-dir', '-o', default=None, help='Default: the directory of the first file.')
+    args = parser.parse_args(args)
+
+    data = build(read_results(args.json_files))
+
+    output_dir = args.output_dir
+    if output_dir is None:
+        output_dir = os.path.dirname(args.json_files[0])
+    with open(os.path.join(output_dir, file_name(data['version'])), 'w') as f:
+        json.dump(data, f)
+
+
+if __name__ == '__main__':
+    main()
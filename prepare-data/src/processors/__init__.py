@@ -1,6 +1,9 @@
-def process(game_data_dir, output, game_version):
+def process(game_data_dir, output, game_version, jobs=1, force=False):
     from .languages import LanguageProcessor
     from .fish import FishProcessor
+    from .locations import LocationProcessor
+    from .bundles import AllBundleProcessor
+    from .gifts import GiftProcessor
 
     return LanguageProcessor.run_all(
         game_data_dir,
@@ -8,5 +11,10 @@ def process(game_data_dir, output, game_version):
         game_version,
         (
             FishProcessor,
+            LocationProcessor,
+            AllBundleProcessor,
+            GiftProcessor,
         ),
+        jobs=jobs,
+        force=force,
     )
@@ -6,9 +6,23 @@ from . import t
 
 
 class AbstractProcessor:
+    # processors whose data this one reads, prepared before it
+    REQUIRES: tuple[type['AbstractProcessor'], ...] = ()
+
     def __init__(self, parent: 'LanguageProcessor'):
         self.parent = parent
 
+    def prepare(self) -> None:
+        """
+        Loads and parses everything this processor needs, once every processor in REQUIRES is prepared.
+        Processors that do not depend on each other are prepared concurrently.
+        """
+
+    @property
+    def rows(self) -> int | None:
+        """Number of records parsed, for the timing report."""
+        return None
+
     def __call__(self, result: t.Result):
         raise NotImplementedError
 
@@ -54,10 +68,22 @@ class FileProcessor(AbstractProcessor):
 class JsonFileProcessor(FileProcessor):
     EXT = 'json'
 
-    @cached_property
-    def _raw_data(self):
+    def _load_raw_data(self):
         with open(self._source_file_name) as f:
             return json.load(f)
 
+    def _shared(self, owner: type, compute):
+        """
+        Something computed from the source file, shared by all languages that read the same file.
+        The source file is recorded either way.
+        """
+        self.parent.add_source_file(self._source_file_name)
+        return self.parent.shared.get((owner, self._source_file_name), compute)
+
+    @cached_property
+    def _raw_data(self):
+        # files without a locale are read once for all languages
+        return self._shared(JsonFileProcessor, self._load_raw_data)
+
 
 from .languages import LanguageProcessor
@@ -32,6 +32,13 @@ class BundleProcessorMixin(AbstractExtendFishProcessor):
     def _fish_bundles(self) -> dict[t.Fish.Id, t.Bundle]:
         yield from self
 
+    def prepare(self) -> None:
+        _ = self._fish_bundles
+
+    @property
+    def rows(self) -> int:
+        return len(self._bundles)
+
     def extend_fish(self, fish: t.Fish) -> None:
         if fish.id not in self._fish_bundles:
             return
@@ -86,6 +93,13 @@ class RemixedBundleNameProcessor(JsonFileProcessor):
     def __getitem__(self, en_name: t.Bundle.EnName) -> t.Bundle.Name | None:
         return self._raw_data.get(en_name)
 
+    def prepare(self) -> None:
+        _ = self._raw_data
+
+    @property
+    def rows(self) -> int:
+        return len(self._raw_data)
+
 
 class RemixedBundleProcessor(JsonFileProcessor, BundleProcessorMixin):
     FILENAME = os.path.join('Data', 'RandomBundles')
@@ -93,13 +107,24 @@ class RemixedBundleProcessor(JsonFileProcessor, BundleProcessorMixin):
 
     QUALITY = 'GQ '
 
-    @property
-    def _raw_bundles(self) -> typing.Iterator:
+    REQUIRES = (FishProcessor, RemixedBundleNameProcessor)
+
+    def _iter_raw_data(self) -> typing.Iterator:
         for area in self._raw_data:
             for bundle_set in area['BundleSets']:
                 yield from bundle_set['Bundles']
             yield from area['Bundles']
 
+    @returns(list)
+    def _parse_bundles(self) -> list[tuple[t.Bundle.EnName, list[t.Fish.Id]]]:
+        for raw_bundle in self._iter_raw_data():
+            yield raw_bundle['Name'], list(self._parse_items(raw_bundle['Items']))
+
+    @property
+    def _raw_bundles(self) -> typing.Iterator[tuple[t.Bundle.EnName, list[t.Fish.Id]]]:
+        # the same for every language, only names are localized
+        yield from self._shared(RemixedBundleProcessor, self._parse_bundles)
+
     @cached_property
     def _fish_processor(self) -> FishProcessor:
         return self.parent.get_processor(FishProcessor)
@@ -120,13 +145,13 @@ class RemixedBundleProcessor(JsonFileProcessor, BundleProcessorMixin):
         return self.parent.get_processor(RemixedBundleNameProcessor)
 
     def _process_bundle(self, raw_bundle) -> typing.Iterator[tuple[t.Fish.Id, t.Bundle]]:
-        en_name = raw_bundle['Name']
+        en_name, fish_ids = raw_bundle
         bundle = t.Bundle(
             en_name=en_name,
             name=self._bundle_name_processor[en_name],
         )
 
-        for fish_id in self._parse_items(raw_bundle['Items']):
+        for fish_id in fish_ids:
             yield fish_id, bundle
 
 
@@ -135,6 +160,7 @@ class AllBundleProcessor(BundleProcessorMixin):
         BundleProcessor,
         RemixedBundleProcessor,
     )
+    REQUIRES = PROCESSORS
 
     @property
     def _processors(self) -> list[BundleProcessorMixin]:
@@ -70,12 +70,41 @@ class FishProcessor(JsonFileProcessor):
         else:
             localized_name = name
 
+        fields = (
+            behavior,
+            min_size, max_size,
+            time_ranges,
+            weather,
+            max_depth,
+            spawn_multi,
+            depth_multi,
+            min_level,
+            difficulty,
+        )
+        # these fields are the same in every language
         return t.Fish(
             id=id_,
             en_name=name,
             name=localized_name,
-            time_ranges=self._parse_time_ranges(time_ranges),
-            weather=self._parse_weather(weather),
+            **self.parent.shared.get((FishProcessor, fields), lambda: self._parse_fields(*fields)),
+        )
+
+    @classmethod
+    def _parse_fields(
+            cls,
+            behavior: str,
+            min_size: str, max_size: str,
+            time_ranges: str,
+            weather: str,
+            max_depth: str,
+            spawn_multi: str,
+            depth_multi: str,
+            min_level: str,
+            difficulty: str,
+    ) -> dict[str, typing.Any]:
+        return dict(
+            time_ranges=cls._parse_time_ranges(time_ranges),
+            weather=cls._parse_weather(weather),
             min_level=int(min_level),
             max_depth=int(max_depth),
             spawn_multi=float(spawn_multi),
@@ -108,32 +137,25 @@ class FishProcessor(JsonFileProcessor):
     def get_id_from_en_name(self, en_name: t.Fish.EnName) -> t.Fish.Id | None:
         return self._en_name_id_map.get(en_name)
 
-    @property
-    def _extend_processors(self) -> typing.Iterator['Processor']:
-        from .locations import LocationProcessor
-        yield self.parent.get_processor(LocationProcessor)
-        from .bundles import AllBundleProcessor
-        yield self.parent.get_processor(AllBundleProcessor)
-        from .gifts import GiftProcessor
-        yield self.parent.get_processor(GiftProcessor)
-
-    def _extend(self):
-        for fish in self._fish.values():
-            for processor in self._extend_processors:
-                processor.extend_fish(fish)
+    def prepare(self) -> None:
+        _ = self._fish
 
-    @cached_property
-    def _fish_extended(self) -> dict[str, t.Fish]:
-        self._extend()
-        return self._fish
+    @property
+    def rows(self) -> int:
+        return len(self._fish)
 
     def __call__(self, result: t.Result):
-        result.fish = self._fish_extended
+        result.fish = self._fish
 
 
 class AbstractExtendFishProcessor(AbstractProcessor):
+    """Adds data to every fish of the result, after FishProcessor."""
+
+    REQUIRES = (FishProcessor,)
+
     def extend_fish(self, fish: t.Fish) -> None:
         raise NotImplementedError
 
-
-Processor = typing.TypeVar('Processor', bound=AbstractExtendFishProcessor)
+    def __call__(self, result: t.Result):
+        for fish in result.fish.values():
+            self.extend_fish(fish)
@@ -23,6 +23,13 @@ class CharacterNameProcessor(JsonFileProcessor):
     def __getitem__(self, character_key: t.Character.Key) -> t.Character.Name:
         return self._names[character_key]
 
+    def prepare(self) -> None:
+        _ = self._names
+
+    @property
+    def rows(self) -> int:
+        return len(self._names)
+
 
 class GiftProcessor(JsonFileProcessor, AbstractExtendFishProcessor):
     FILENAME = os.path.join('Data', 'NPCGiftTastes')
@@ -33,6 +40,8 @@ class GiftProcessor(JsonFileProcessor, AbstractExtendFishProcessor):
         t.Character.LIKES: 3,
     }
 
+    REQUIRES = (FishProcessor, CharacterNameProcessor)
+
     @classmethod
     def _should_skip(cls, character_key: t.Character.Key) -> bool:
         for skip_prefix in cls.SKIP_PREFIX:
@@ -62,7 +71,7 @@ class GiftProcessor(JsonFileProcessor, AbstractExtendFishProcessor):
 
     @cached_property
     def _character_name_processor(self) -> CharacterNameProcessor:
-        return CharacterNameProcessor(self.parent)
+        return self.parent.get_processor(CharacterNameProcessor)
 
     @cached_property
     @returns(Merge(2))
@@ -77,6 +86,13 @@ class GiftProcessor(JsonFileProcessor, AbstractExtendFishProcessor):
             for fish_id, preference_type in self._parse_character_preferences(value):
                 yield fish_id, (preference_type, character)
 
+    def prepare(self) -> None:
+        _ = self._fish_preferences
+
+    @property
+    def rows(self) -> int:
+        return len(self._fish_preferences)
+
     def extend_fish(self, fish: t.Fish) -> None:
         if fish.id not in self._fish_preferences:
             return
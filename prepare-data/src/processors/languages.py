@@ -1,12 +1,39 @@
 import json
 import os
+import time
 import typing
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from graphlib import TopologicalSorter
 from functools import cached_property
 
 from returns import returns
 
-from utils import JSONEncoder
+import multilang
+import snapshot
+from utils import DataclassJSONWriter
 from . import t
+from .manifest import Manifest, file_hash
+from .shared import SharedCache
+
+
+class LanguageRun(typing.NamedTuple):
+    output_file_name: str
+    # None if the language was skipped
+    seconds: float | None
+    # source file relative to the game data directory -> hash
+    sources: dict[str, str]
+    # processor name -> (seconds, rows)
+    timings: dict[str, tuple[float, int | None]]
+
+
+# shared by every language processed in a worker process of run_all
+_worker_shared: SharedCache | None = None
+
+
+def _init_worker():
+    global _worker_shared
+    _worker_shared = SharedCache()
 
 
 class LanguageProcessor:
@@ -25,25 +52,130 @@ class LanguageProcessor:
         'hu-HU': 'Magyar',  # Hungarian
     }
 
+    # processors of a language that are prepared at the same time
+    THREADS = 4
+
+    @classmethod
+    def _run(
+            cls,
+            game_data_dir: str,
+            output: str,
+            game_version: str,
+            lang_code: t.LangCode,
+            processors: typing.Sequence[typing.Type['Processor']],
+            shared: SharedCache = None,
+    ) -> LanguageRun:
+        start = time.perf_counter()
+        if shared is None:
+            shared = _worker_shared
+        processor = cls(
+            game_data_dir,
+            output,
+            game_version,
+            lang_code,
+            processors,
+            shared,
+        )
+        processor()
+        return LanguageRun(
+            output_file_name=processor._output_file_name,
+            seconds=time.perf_counter() - start,
+            sources=processor._source_hashes,
+            timings=processor._timings,
+        )
+
     @classmethod
-    @returns(list)
     def run_all(
             cls,
             game_data_dir: str,
             output: str,
             game_version: str,
             processors: typing.Sequence[typing.Type['Processor']],
+            *,
+            jobs: int = 1,
+            force: bool = False,
     ) -> list[str]:
+        """
+        Languages whose source files and code did not change since they were built are skipped,
+        unless `force` is set.
+        With `jobs` > 1, languages are processed in that many processes.
+        Output file names are in the order of LANGUAGES either way.
+        """
+        start = time.perf_counter()
+        manifest = Manifest(output, game_data_dir)
+
+        runs: dict[t.LangCode, LanguageRun] = {}
+        to_build = []
         for lang_code in cls.LANGUAGES:
-            processor = cls(
-                game_data_dir,
-                output,
-                game_version,
-                lang_code,
-                processors,
-            )
-            processor()
-            yield processor._output_file_name
+            processor = cls(game_data_dir, output, game_version, lang_code, processors)
+            if not force and manifest.is_current(
+                    game_version,
+                    processor._output_file_name,
+                    os.path.basename(processor._snapshot_file_path),
+            ):
+                runs[lang_code] = processor._load_output()
+            else:
+                to_build.append(lang_code)
+
+        args = [
+            (game_data_dir, output, game_version, lang_code, processors)
+            for lang_code in to_build
+        ]
+        if jobs > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+                built = list(executor.map(cls._run, *zip(*args)))
+        else:
+            shared = SharedCache()
+            built = [cls._run(*run_args, shared) for run_args in args]
+
+        for lang_code, run in zip(to_build, built):
+            runs[lang_code] = run
+            manifest.record(game_version, run.output_file_name, run.sources)
+        runs = [runs[lang_code] for lang_code in cls.LANGUAGES]
+
+        multi_language_file = os.path.join(output, multilang.file_name(game_version))
+        if built or not os.path.exists(multi_language_file):
+            cls._write_multi_language(output, game_version, [run.output_file_name for run in runs])
+        manifest.save()
+
+        skipped = [run.output_file_name for run in runs if run.seconds is None]
+        if skipped:
+            print(f'Skipped {len(skipped)} unchanged languages: {", ".join(skipped)}')
+        elapsed = time.perf_counter() - start
+        work = sum(run.seconds for run in built)
+        print(
+            f'Processed {len(built)} languages with {jobs} job(s) in {elapsed:.1f}s '
+            f'({work:.1f}s one after another, {work / elapsed:.1f}x)'
+        )
+        if built:
+            cls._print_timings(built)
+        return [run.output_file_name for run in runs]
+
+    @staticmethod
+    def _print_timings(runs: typing.Iterable[LanguageRun]) -> None:
+        seconds = defaultdict(float)
+        rows = defaultdict(int)
+        for run in runs:
+            for name, (processor_seconds, processor_rows) in run.timings.items():
+                seconds[name] += processor_seconds
+                rows[name] += processor_rows or 0
+
+        header = f'{"processor":<28} | {"seconds":>8} | {"rows":>8}'
+        print(header)
+        print('-' * len(header))
+        for name in sorted(seconds, key=seconds.get, reverse=True):
+            print(f'{name:<28} | {seconds[name]:>8.3f} | {rows[name]:>8}')
+
+    @staticmethod
+    def _write_multi_language(output: str, game_version: str, output_file_names: list[str]) -> None:
+        # one language at a time, instead of holding the results of every language
+        results = multilang.read_results(
+            os.path.join(output, output_file_name)
+            for output_file_name in output_file_names
+        )
+        data = multilang.build(results)
+        with open(os.path.join(output, multilang.file_name(game_version)), 'w') as f:
+            json.dump(data, f)
 
     def __init__(
             self,
@@ -52,14 +184,33 @@ class LanguageProcessor:
             game_version: str,
             lang_code: t.LangCode,
             processors: typing.Sequence[typing.Type['Processor']],
+            shared: SharedCache = None,
     ):
         self.game_data_dir = game_data_dir
         self.output = output
         self.game_version = game_version
         self.lang_code = lang_code
         self.processors = processors
+        if shared is None:
+            shared = SharedCache()
+        self.shared = shared
 
         self._singletons = {}
+        self._source_files: set[str] = set()
+        self._seconds: dict[typing.Type['Processor'], float] = defaultdict(float)
+
+    def add_source_file(self, source_file: str) -> None:
+        """Records a file that the result depends on."""
+        self._source_files.add(source_file)
+
+    @property
+    @returns(dict)
+    def _source_hashes(self) -> dict[str, str]:
+        for source_file in sorted(self._source_files):
+            yield (
+                os.path.relpath(source_file, self.game_data_dir),
+                self.shared.get((file_hash, source_file), lambda: file_hash(source_file)),
+            )
 
     def translate(self, translatable: t.Translatable) -> str | None:
         if translatable is None or isinstance(translatable, str):
@@ -79,22 +230,70 @@ class LanguageProcessor:
             self._singletons[processor_cls] = processor_cls(self)
         return self._singletons[processor_cls]
 
-    @property
-    def _processors(self) -> typing.Iterable['Processor']:
-        for processor_cls in self.processors:
-            yield self.get_processor(processor_cls)
+    @cached_property
+    def _graph(self) -> dict[typing.Type['Processor'], tuple[typing.Type['Processor'], ...]]:
+        """Every processor that is needed, and the processors it requires."""
+        graph = {}
+        pending = list(self.processors)
+        while pending:
+            processor_cls = pending.pop()
+            if processor_cls in graph:
+                continue
+            graph[processor_cls] = processor_cls.REQUIRES
+            pending.extend(processor_cls.REQUIRES)
+        return graph
+
+    def _prepare(self, processor_cls: typing.Type['Processor']) -> None:
+        start = time.perf_counter()
+        self.get_processor(processor_cls).prepare()
+        self._seconds[processor_cls] += time.perf_counter() - start
+
+    def _prepare_all(self) -> None:
+        # created up front, so that threads only look them up
+        for processor_cls in self._graph:
+            self.get_processor(processor_cls)
+
+        sorter = TopologicalSorter(self._graph)
+        sorter.prepare()
+        with ThreadPoolExecutor(max_workers=self.THREADS) as executor:
+            running = {}
+            while sorter.is_active():
+                for processor_cls in sorter.get_ready():
+                    running[executor.submit(self._prepare, processor_cls)] = processor_cls
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                    sorter.done(running.pop(future))
 
     @cached_property
     def _result(self) -> t.Result:
+        self._prepare_all()
         result = t.Result(
             version=self.game_version,
             lang_code=self.lang_code,
             language=self._language,
         )
-        for file_processor in self._processors:
-            file_processor(result)
+        # processors that write to the result, after the processors they require
+        for processor_cls in TopologicalSorter(self._graph).static_order():
+            if processor_cls not in self.processors:
+                continue
+            start = time.perf_counter()
+            self.get_processor(processor_cls)(result)
+            self._seconds[processor_cls] += time.perf_counter() - start
         return result
 
+    @property
+    @returns(dict)
+    def _timings(self) -> dict[str, tuple[float, int | None]]:
+        for processor_cls, seconds in self._seconds.items():
+            yield processor_cls.__name__, (seconds, self.get_processor(processor_cls).rows)
+
+    @cached_property
+    def _result_dict(self) -> dict:
+        """The result as read back from the output file, for the snapshot."""
+        with open(self._output_file_path) as f:
+            return json.load(f)
+
     @cached_property
     def _output_file_name(self) -> str:
         return f'{self.game_version} ({self._language}).json'
@@ -103,9 +302,23 @@ class LanguageProcessor:
     def _output_file_path(self) -> str:
         return os.path.join(self.output, self._output_file_name)
 
+    @cached_property
+    def _snapshot_file_path(self) -> str:
+        return snapshot.file_name(self._output_file_path)
+
+    def _load_output(self) -> LanguageRun:
+        return LanguageRun(
+            output_file_name=self._output_file_name,
+            seconds=None,
+            sources={},
+            timings={},
+        )
+
     def __call__(self):
         with open(self._output_file_path, 'w') as f:
-            json.dump(self._result, f, cls=JSONEncoder)
+            # fish share the same locations, bundles and characters
+            DataclassJSONWriter(interned=(t.Location, t.Bundle, t.Character)).dump(self._result, f)
+        snapshot.write(self._snapshot_file_path, self._result_dict)
 
 
 from .base import AbstractProcessor
@@ -7,7 +7,7 @@ from returns import returns
 from utils import merge
 from . import t
 from .base import JsonFileProcessor, AbstractProcessor
-from .fish import AbstractExtendFishProcessor
+from .fish import FishProcessor, AbstractExtendFishProcessor
 
 
 class LocationNameProcessor(AbstractProcessor):
@@ -48,6 +48,13 @@ class LocationNameProcessor(AbstractProcessor):
 
     LOCATION_VARIATION_ANY = '-1'
 
+    def prepare(self) -> None:
+        _ = self._names
+
+    @property
+    def rows(self) -> int:
+        return len(self._names)
+
     @returns(dict)
     def _process_location(self, location_key: t.Location.Key) -> dict[t.Location.Variation, t.Location.Name]:
         location_name_locale_dict, variations = self.LOCATIONS[location_key]
@@ -88,6 +95,10 @@ class LocationNameProcessor(AbstractProcessor):
         return self._names[location_key][location_variation]
 
 
+# fish ID, location key, variation, original variation, season
+ParsedLocation = tuple[t.Fish.Id, t.Location.Key, t.Location.Variation, t.Location.Variation, str]
+
+
 class LocationProcessor(JsonFileProcessor, AbstractExtendFishProcessor):
     FILENAME = os.path.join('Data', 'Locations')
     USE_LOCALE = False
@@ -100,6 +111,8 @@ class LocationProcessor(JsonFileProcessor, AbstractExtendFishProcessor):
     SEASON_SKIP = {'-1'}
     SEASONS = ('spring', 'summer', 'fall', 'winter')
 
+    REQUIRES = (FishProcessor, LocationNameProcessor)
+
     @cached_property
     def _location_name_processor(self) -> LocationNameProcessor:
         return self.parent.get_processor(LocationNameProcessor)
@@ -113,27 +126,48 @@ class LocationProcessor(JsonFileProcessor, AbstractExtendFishProcessor):
         for i in range(0, len(items), 2):
             yield items[i], items[i + 1]
 
-    def _parse_location(self, key: t.Location.Key, value: str) -> typing.Iterator[tuple[t.Fish.Id, t.Location]]:
+    def _parse_location(
+            self,
+            key: t.Location.Key,
+            value: str,
+    ) -> typing.Iterator[ParsedLocation]:
         # https://stardewvalleywiki.com/Modding:Fish_data#Spawn_locations
         for season, season_fish in zip(self.SEASONS, value.split('/')[4:8]):
             for fish_id, variation_orig in self._parse_season_value(season_fish):
-                for variation in self._location_name_processor.expand(key, variation_orig):
-                    yield fish_id, t.Location(
-                        key=key,
-                        variation=variation,
-                        variation_orig=variation_orig,
-                        name=self._location_name_processor[key, variation],
-                        season=season,
-                    )
+                for variation in LocationNameProcessor.expand(key, variation_orig):
+                    yield fish_id, key, variation, variation_orig, season
 
-    @cached_property
-    @returns(merge)
-    def _fish_locations(self) -> dict[t.Fish.Id, list[t.Location]]:
+    @returns(list)
+    def _parse_locations(self) -> list[ParsedLocation]:
         for key, value in self._raw_data.items():
             if key in self.SKIP_LOCATIONS:
                 continue
             yield from self._parse_location(key, value)
 
+    @cached_property
+    def _parsed_locations(self) -> list[ParsedLocation]:
+        # the same for every language, only names are localized
+        return self._shared(LocationProcessor, self._parse_locations)
+
+    @cached_property
+    @returns(merge)
+    def _fish_locations(self) -> dict[t.Fish.Id, list[t.Location]]:
+        for fish_id, key, variation, variation_orig, season in self._parsed_locations:
+            yield fish_id, t.Location(
+                key=key,
+                variation=variation,
+                variation_orig=variation_orig,
+                name=self._location_name_processor[key, variation],
+                season=season,
+            )
+
+    def prepare(self) -> None:
+        _ = self._fish_locations
+
+    @property
+    def rows(self) -> int:
+        return len(self._parsed_locations)
+
     def extend_fish(self, fish: t.Fish) -> None:
         if fish.id not in self._fish_locations:
             return
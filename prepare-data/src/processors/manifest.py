@@ -0,0 +1,91 @@
+import glob
+import hashlib
+import json
+import os
+from functools import cache, cached_property
+
+import multilang
+import snapshot
+import utils
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@cache
+def code_version() -> str:
+    """Hash of the code that produces output files."""
+    h = hashlib.sha256()
+    source_files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '*.py')))
+    source_files += [multilang.__file__, snapshot.__file__, utils.__file__]
+    for source_file in source_files:
+        h.update(os.path.basename(source_file).encode())
+        h.update(file_hash(source_file).encode())
+    return h.hexdigest()
+
+
+class Manifest:
+    """
+    What every output file was built from, stored next to index.json:
+
+        {version: {output file name: {"code": code_version(), "sources": {source file: hash}}}}
+
+    Source files are relative to the game data directory.
+    """
+
+    FILE_NAME = 'manifest.json'
+
+    def __init__(self, output: str, game_data_dir: str):
+        self.output = output
+        self.game_data_dir = game_data_dir
+        self._hashes: dict[str, str | None] = {}
+
+    @cached_property
+    def _path(self) -> str:
+        return os.path.join(self.output, self.FILE_NAME)
+
+    @cached_property
+    def _data(self) -> dict[str, dict[str, dict]]:
+        try:
+            with open(self._path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _source_hash(self, source_file: str) -> str | None:
+        if source_file not in self._hashes:
+            path = os.path.join(self.game_data_dir, source_file)
+            self._hashes[source_file] = file_hash(path) if os.path.exists(path) else None
+        return self._hashes[source_file]
+
+    def is_current(self, game_version: str, output_file_name: str, *other_output_file_names: str) -> bool:
+        """
+        Whether the output files exist and were built by the same code from the same source files.
+        """
+        entry = self._data.get(game_version, {}).get(output_file_name)
+        if entry is None or entry['code'] != code_version():
+            return False
+
+        for file_name in (output_file_name, *other_output_file_names):
+            if not os.path.exists(os.path.join(self.output, file_name)):
+                return False
+
+        for source_file, source_hash in entry['sources'].items():
+            if self._source_hash(source_file) != source_hash:
+                return False
+        return True
+
+    def record(self, game_version: str, output_file_name: str, sources: dict[str, str]) -> None:
+        self._data.setdefault(game_version, {})[output_file_name] = {
+            'code': code_version(),
+            'sources': sources,
+        }
+
+    def save(self) -> None:
+        with open(self._path, 'w') as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
@@ -0,0 +1,51 @@
+import threading
+import typing
+
+T = typing.TypeVar('T')
+
+
+class SharedCache:
+    """
+    Results that are the same for every language, such as files without a locale,
+    computed once and shared by the LanguageProcessor of every language in a process.
+
+    Processors of a language run in threads, so every value is computed by the first thread that asks for it,
+    while other threads asking for the same key wait for it.
+
+    Shared values must not be modified.
+    """
+
+    def __init__(self):
+        self._values: dict[typing.Hashable, typing.Any] = {}
+        # key -> lock held while its value is computed
+        self._computing: dict[typing.Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key: typing.Hashable) -> tuple[bool, typing.Any]:
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return True, self._values[key]
+            return False, None
+
+    def get(self, key: typing.Hashable, compute: typing.Callable[[], T]) -> T:
+        found, value = self._cached(key)
+        if found:
+            return value
+
+        with self._lock:
+            key_lock = self._computing.setdefault(key, threading.Lock())
+        with key_lock:
+            # computed by another thread while waiting
+            found, value = self._cached(key)
+            if found:
+                return value
+
+            value = compute()
+            with self._lock:
+                self.misses += 1
+                self._values[key] = value
+                del self._computing[key]
+        return value
@@ -0,0 +1,325 @@
+"""
+Compact binary snapshot of a game data file.
+
+All strings are interned into one table and referenced by index.
+Locations, bundles and characters are deduplicated into fixed-width tables,
+fish are fixed-width records, and every variable-length list lives in one pool of u32.
+
+Readers mmap the file and decode fish lazily into the same dicts that the JSON file would give.
+"""
+import mmap
+import struct
+import typing
+from collections.abc import Mapping
+from functools import cached_property
+
+from returns import returns
+
+MAGIC = b'SFVS'
+FORMAT_VERSION = 1
+EXT = 'bin'
+
+NONE = 0xFFFFFFFF
+
+# magic, format version, then (offset, count) for each section, then meta string ids
+HEADER = struct.Struct('<4sH2x' + 'II' * 7 + 'III')
+STRING_OFFSET = struct.Struct('<I')
+LOCATION = struct.Struct('<5I')
+BUNDLE = struct.Struct('<2I')
+CHARACTER = struct.Struct('<2I')
+# id, en_name, name, behavior, difficulty, min_level, max_depth, spawn_multi, depth_multi, min_size, max_size,
+# then (offset, count) into the pool for time_ranges, weather, locations, bundles, gifts
+FISH = struct.Struct('<4I3i2d2i' + 'II' * 5)
+POOL = struct.Struct('<I')
+
+LOCATION_FIELDS = ('key', 'variation', 'variation_orig', 'name', 'season')
+BUNDLE_FIELDS = ('en_name', 'name')
+CHARACTER_FIELDS = ('key', 'name')
+
+
+def file_name(json_file_name: str) -> str:
+    if json_file_name.endswith('.json'):
+        json_file_name = json_file_name[:-len('.json')]
+    return f'{json_file_name}.{EXT}'
+
+
+class _Table:
+    def __init__(self, fields: tuple[str, ...], strings: '_Strings'):
+        self.fields = fields
+        self.strings = strings
+        self.rows: dict[tuple[int, ...], int] = {}
+
+    def __call__(self, item: dict) -> int:
+        row = tuple(self.strings(item[field]) for field in self.fields)
+        return self.rows.setdefault(row, len(self.rows))
+
+
+class _Strings:
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+
+    def __call__(self, s: str | None) -> int:
+        if s is None:
+            return NONE
+        return self.ids.setdefault(s, len(self.ids))
+
+
+class SnapshotWriter:
+    def __init__(self, result: dict):
+        self.result = result
+        self._strings = _Strings()
+        self._locations = _Table(LOCATION_FIELDS, self._strings)
+        self._bundles = _Table(BUNDLE_FIELDS, self._strings)
+        self._characters = _Table(CHARACTER_FIELDS, self._strings)
+        self._pool: list[int] = []
+        self._fish: list[tuple] = []
+
+    def _pool_list(self, items: typing.Sequence | None, encode: typing.Callable[[typing.Any], typing.Iterable[int]]):
+        if items is None:
+            return 0, NONE
+        offset = len(self._pool)
+        for item in items:
+            self._pool.extend(encode(item))
+        return offset, len(items)
+
+    def _encode_gifts(self, gifts: Mapping | None) -> tuple[int, int]:
+        if gifts is None:
+            return 0, NONE
+        offset = len(self._pool)
+        for preference_type, characters in gifts.items():
+            self._pool.append(self._strings(preference_type))
+            self._pool.append(len(characters))
+            for character in characters:
+                self._pool.append(self._characters(character))
+        return offset, len(gifts)
+
+    def _add_fish(self, fish: dict):
+        self._fish.append((
+            self._strings(fish['id']),
+            self._strings(fish['en_name']),
+            self._strings(fish['name']),
+            self._strings(fish['behavior']),
+            fish['difficulty'],
+            fish['min_level'],
+            fish['max_depth'],
+            fish['spawn_multi'],
+            fish['depth_multi'],
+            *fish['size_range'],
+            *self._pool_list(fish['time_ranges'], lambda time_range: time_range),
+            *self._pool_list(fish['weather'], lambda weather: (self._strings(weather),)),
+            *self._pool_list(fish['locations'], lambda location: (self._locations(location),)),
+            *self._pool_list(fish['bundles'], lambda bundle: (self._bundles(bundle),)),
+            *self._encode_gifts(fish['gifts']),
+        ))
+
+    @staticmethod
+    def _pack_rows(packer: struct.Struct, rows: typing.Iterable) -> bytes:
+        return b''.join(packer.pack(*row) for row in rows)
+
+    def __bytes__(self) -> bytes:
+        meta = (
+            self._strings(self.result['version']),
+            self._strings(self.result['lang_code']),
+            self._strings(self.result['language']),
+        )
+        for fish in self.result['fish'].values():
+            self._add_fish(fish)
+
+        blob = bytearray()
+        string_offsets = []
+        for s in self._strings.ids:
+            string_offsets.append(len(blob))
+            blob += s.encode()
+        string_offsets.append(len(blob))
+
+        sections = [
+            (self._pack_rows(STRING_OFFSET, ((offset,) for offset in string_offsets)), len(self._strings.ids)),
+            (bytes(blob), len(blob)),
+            (self._pack_rows(LOCATION, self._locations.rows), len(self._locations.rows)),
+            (self._pack_rows(BUNDLE, self._bundles.rows), len(self._bundles.rows)),
+            (self._pack_rows(CHARACTER, self._characters.rows), len(self._characters.rows)),
+            (self._pack_rows(FISH, self._fish), len(self._fish)),
+            (self._pack_rows(POOL, ((value,) for value in self._pool)), len(self._pool)),
+        ]
+
+        header = []
+        offset = HEADER.size
+        for data, count in sections:
+            header += [offset, count]
+            offset += len(data)
+
+        return HEADER.pack(MAGIC, FORMAT_VERSION, *header, *meta) + b''.join(data for data, _ in sections)
+
+
+def write(path: str, result: dict) -> None:
+    with open(path, 'wb') as f:
+        f.write(bytes(SnapshotWriter(result)))
+
+
+class _LazyFish(Mapping):
+    def __init__(self, snapshot: 'Snapshot'):
+        self._snapshot = snapshot
+        self._decoded: dict[int, dict] = {}
+
+    @cached_property
+    @returns(dict)
+    def _rows(self) -> dict[str, int]:
+        snapshot = self._snapshot
+        for row in range(snapshot.fish_count):
+            fish_id, = struct.unpack_from('<I', snapshot.buffer, snapshot.fish_offset + row * FISH.size)
+            yield snapshot.string(fish_id), row
+
+    def __getitem__(self, fish_id: str) -> dict:
+        row = self._rows[fish_id]
+        if row not in self._decoded:
+            self._decoded[row] = self._snapshot.decode_fish(row)
+        return self._decoded[row]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return self._snapshot.fish_count
+
+
+class Snapshot(Mapping):
+    """
+    Read-only view of a snapshot with the same keys as the JSON data file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic, format_version,
+            self._string_offsets_offset, self._string_count,
+            self._blob_offset, _,
+            self._locations_offset, _,
+            self._bundles_offset, _,
+            self._characters_offset, _,
+            self.fish_offset, self.fish_count,
+            self._pool_offset, _,
+            *meta,
+        ) = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f'{path} is not a version {FORMAT_VERSION} snapshot')
+
+        self._strings: list[str | None] = [None] * self._string_count
+        self._records: dict[tuple[int, int], dict] = {}
+        self._meta = dict(zip(('version', 'lang_code', 'language'), (self.string(i) for i in meta)))
+        self._meta['fish'] = _LazyFish(self)
+
+    def string(self, i: int) -> str | None:
+        if i == NONE:
+            return None
+        s = self._strings[i]
+        if s is None:
+            start, end = struct.unpack_from('<2I', self.buffer, self._string_offsets_offset + i * STRING_OFFSET.size)
+            s = self._strings[i] = str(self.buffer[self._blob_offset + start:self._blob_offset + end], 'utf-8')
+        return s
+
+    def _pool(self, offset: int, count: int) -> tuple[int, ...]:
+        return struct.unpack_from(f'<{count}I', self.buffer, self._pool_offset + offset * POOL.size)
+
+    def _record(self, packer: struct.Struct, table_offset: int, i: int, fields: tuple[str, ...]) -> dict:
+        # records are shared between fish, the same way they are shared in prepare-data
+        key = table_offset, i
+        if key not in self._records:
+            string_ids = packer.unpack_from(self.buffer, table_offset + i * packer.size)
+            self._records[key] = {
+                field: self.string(string_id)
+                for field, string_id in zip(fields, string_ids)
+            }
+        return self._records[key]
+
+    def _location(self, i: int) -> dict:
+        return self._record(LOCATION, self._locations_offset, i, LOCATION_FIELDS)
+
+    def _bundle(self, i: int) -> dict:
+        return self._record(BUNDLE, self._bundles_offset, i, BUNDLE_FIELDS)
+
+    def _character(self, i: int) -> dict:
+        return self._record(CHARACTER, self._characters_offset, i, CHARACTER_FIELDS)
+
+    def _list(self, offset: int, count: int, decode: typing.Callable[[int], typing.Any]) -> list | None:
+        if count == NONE:
+            return None
+        return [decode(value) for value in self._pool(offset, count)]
+
+    def _time_ranges(self, offset: int, count: int) -> list[list[int]]:
+        values = self._pool(offset, count * 2)
+        return [list(values[i:i + 2]) for i in range(0, len(values), 2)]
+
+    def _gifts(self, offset: int, count: int) -> dict[str, list[dict]] | None:
+        if count == NONE:
+            return None
+        gifts = {}
+        for _ in range(count):
+            preference_type, character_count = self._pool(offset, 2)
+            characters = self._pool(offset + 2, character_count)
+            gifts[self.string(preference_type)] = [self._character(i) for i in characters]
+            offset += 2 + character_count
+        return gifts
+
+    def decode_fish(self, row: int) -> dict:
+        (
+            fish_id, en_name, name, behavior,
+            difficulty, min_level, max_depth,
+            spawn_multi, depth_multi,
+            min_size, max_size,
+            time_ranges_offset, time_ranges_count,
+            weather_offset, weather_count,
+            locations_offset, locations_count,
+            bundles_offset, bundles_count,
+            gifts_offset, gifts_count,
+        ) = FISH.unpack_from(self.buffer, self.fish_offset + row * FISH.size)
+
+        return {
+            'id': self.string(fish_id),
+            'en_name': self.string(en_name),
+            'name': self.string(name),
+            'time_ranges': self._time_ranges(time_ranges_offset, time_ranges_count),
+            'weather': self._list(weather_offset, weather_count, self.string),
+            'min_level': min_level,
+            'max_depth': max_depth,
+            'spawn_multi': spawn_multi,
+            'depth_multi': depth_multi,
+            'behavior': self.string(behavior),
+            'difficulty': difficulty,
+            'size_range': [min_size, max_size],
+            'locations': self._list(locations_offset, locations_count, self._location),
+            'bundles': self._list(bundles_offset, bundles_count, self._bundle),
+            'gifts': self._gifts(gifts_offset, gifts_count),
+        }
+
+    def __getitem__(self, key: str):
+        return self._meta[key]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._meta)
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+
+def load(path: str) -> Snapshot:
+    return Snapshot(path)
+
+
+def main(args=None):
+    import json
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description='Write a snapshot next to each JSON data file.')
+    parser.add_argument('json_files', nargs='+')
+    args = parser.parse_args(args)
+
+    for json_file in args.json_files:
+        with open(json_file) as f:
+            result = json.load(f)
+        write(file_name(json_file), result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import io
+import json
+import unittest
+
+from processors import t
+from utils import DataclassJSONWriter, JSONEncoder
+
+
+def _prepared_language() -> t.Result:
+    """A result like the one of a prepared language, with objects shared by several fish."""
+    beach = t.Location(key='Beach', variation='-1', variation_orig='-1', name='浜辺', season='summer')
+    forest = t.Location(key='Forest', variation='0', variation_orig='River', name='シンダーサップの森', season='summer')
+    ocean_bundle = t.Bundle(en_name='Ocean Fish', name='海の魚')
+    willy = t.Character(key='Willy', name='ウィリー')
+    elliott = t.Character(key='Elliott', name='エリオット')
+    return t.Result(
+        version='1.5.6.22018',
+        lang_code='ja-JP',
+        language='日本語',
+        fish={
+            '128': t.Fish(
+                id='128',
+                en_name='Pufferfish',
+                name='フグ',
+                time_ranges=[(1200, 1600)],
+                weather=['sunny'],
+                min_level=0,
+                max_depth=4,
+                spawn_multi=0.3,
+                depth_multi=0.5,
+                behavior='floater',
+                difficulty=80,
+                size_range=(1, 37),
+                locations=[beach],
+                bundles=[ocean_bundle],
+                gifts={t.Character.LOVES: [willy], t.Character.LIKES: [elliott]},
+            ),
+            '131': t.Fish(
+                id='131',
+                en_name='Sardine',
+                name='イワシ',
+                time_ranges=[(600, 1900)],
+                weather=['sunny', 'rainy'],
+                min_level=0,
+                max_depth=4,
+                spawn_multi=0.1,
+                depth_multi=0.1,
+                behavior='dart',
+                difficulty=30,
+                size_range=(1, 13),
+                locations=[beach, forest],
+                bundles=[ocean_bundle],
+                gifts={t.Character.LIKES: [willy, elliott]},
+            ),
+            '132': t.Fish(
+                id='132',
+                en_name='Bream',
+                name='ブリーム',
+                time_ranges=[(1800, 2600)],
+                weather=['sunny', 'rainy'],
+                min_level=0,
+                max_depth=1,
+                spawn_multi=float('inf'),
+                depth_multi=float('nan'),
+                behavior='smooth',
+                difficulty=35,
+                size_range=(12, 31),
+                locations=[forest],
+            ),
+        },
+    )
+
+
+class DataclassJSONWriterTest(unittest.TestCase):
+    def test_same_as_json_dump(self):
+        result = _prepared_language()
+
+        expected = io.StringIO()
+        json.dump(result, expected, cls=JSONEncoder)
+        written = io.StringIO()
+        DataclassJSONWriter(interned=(t.Location, t.Bundle, t.Character)).dump(result, written)
+
+        self.assertEqual(written.getvalue(), expected.getvalue())
+
+    def test_not_interned(self):
+        result = _prepared_language()
+        self.assertEqual(DataclassJSONWriter().encode(result), json.dumps(result, cls=JSONEncoder))
+
+
+if __name__ == '__main__':
+    unittest.main()
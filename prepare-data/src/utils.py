@@ -1,8 +1,8 @@
-import dataclasses
 import json
 import typing
 from collections import defaultdict
 from functools import cached_property
+from json.encoder import INFINITY, encode_basestring_ascii
 
 from returns import returns
 
@@ -62,6 +62,121 @@ def convert_items(items, converter) -> list:
 class JSONEncoder(json.JSONEncoder):
     # https://stackoverflow.com/a/51286749/3248736
     def default(self, o):
+        import dataclasses
         if dataclasses.is_dataclass(o):
             return dataclasses.asdict(o)
         return super().default(o)
+
+
+class DataclassJSONWriter:
+    """
+    Same output as `json.dump(o, f, cls=JSONEncoder)`,
+    but dataclasses are read field by field instead of being copied into dicts first,
+    and the top levels are written to the file as they are encoded.
+
+    Instances of `interned` types are encoded once and reused wherever the same object appears again.
+    """
+
+    # levels of dataclasses and dicts that are written member by member; deeper values are written at once
+    STREAM_DEPTH = 2
+
+    def __init__(self, *, interned: tuple[type, ...] = ()):
+        self.interned = interned
+        # None for types that are not dataclasses
+        self._fields: dict[type, tuple[str, ...] | None] = {}
+        # id -> (object, encoded), holding the object so that its id is not reused
+        self._interned: dict[int, tuple[typing.Any, str]] = {}
+
+    def _field_names(self, cls: type) -> tuple[str, ...] | None:
+        try:
+            return self._fields[cls]
+        except KeyError:
+            # imported here, as recommend imports this module at start-up without writing any dataclass
+            import dataclasses
+            names = self._fields[cls] = (
+                tuple(field.name for field in dataclasses.fields(cls))
+                if dataclasses.is_dataclass(cls)
+                else None
+            )
+            return names
+
+    def _items(self, o) -> typing.Iterable[tuple[typing.Any, typing.Any]] | None:
+        if isinstance(o, dict):
+            return o.items()
+        names = self._field_names(type(o))
+        if names is not None:
+            return ((name, getattr(o, name)) for name in names)
+        return None
+
+    @staticmethod
+    def _float(o: float) -> str:
+        if o != o:
+            return 'NaN'
+        if o == INFINITY:
+            return 'Infinity'
+        if o == -INFINITY:
+            return '-Infinity'
+        return float.__repr__(o)
+
+    def _key(self, key) -> str:
+        if isinstance(key, str):
+            pass
+        elif isinstance(key, float):
+            key = self._float(key)
+        elif key is True:
+            key = 'true'
+        elif key is False:
+            key = 'false'
+        elif key is None:
+            key = 'null'
+        elif isinstance(key, int):
+            key = int.__repr__(key)
+        else:
+            raise TypeError(f'keys must be str, int, float, bool or None, not {key.__class__.__name__}')
+        return encode_basestring_ascii(key) + ': '
+
+    def _encode_items(self, items: typing.Iterable[tuple[typing.Any, typing.Any]]) -> str:
+        return '{' + ', '.join(self._key(key) + self.encode(value) for key, value in items) + '}'
+
+    def encode(self, o) -> str:
+        if isinstance(o, str):
+            return encode_basestring_ascii(o)
+        if o is None:
+            return 'null'
+        if o is True:
+            return 'true'
+        if o is False:
+            return 'false'
+        if isinstance(o, int):
+            return int.__repr__(o)
+        if isinstance(o, float):
+            return self._float(o)
+        if isinstance(o, (list, tuple)):
+            return '[' + ', '.join(map(self.encode, o)) + ']'
+
+        if isinstance(o, self.interned):
+            interned = self._interned.get(id(o))
+            if interned is None:
+                interned = self._interned[id(o)] = (o, self._encode_items(self._items(o)))
+            return interned[1]
+
+        items = self._items(o)
+        if items is None:
+            raise TypeError(f'Object of type {o.__class__.__name__} is not JSON serializable')
+        return self._encode_items(items)
+
+    def iterencode(self, o, depth: int = STREAM_DEPTH) -> typing.Iterator[str]:
+        items = self._items(o) if depth > 0 and not isinstance(o, self.interned) else None
+        if items is None:
+            yield self.encode(o)
+            return
+
+        yield '{'
+        for i, (key, value) in enumerate(items):
+            yield (', ' if i else '') + self._key(key)
+            yield from self.iterencode(value, depth - 1)
+        yield '}'
+
+    def dump(self, o, f: typing.TextIO) -> None:
+        for chunk in self.iterencode(o):
+            f.write(chunk)
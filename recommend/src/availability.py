@@ -0,0 +1,111 @@
+from functools import cached_property
+
+from returns import returns
+
+from config import ConfigSnapshot
+
+
+class FishAvailability:
+    def __init__(self, mask: int, entries: list[tuple[int, dict]]):
+        # union of all entry masks
+        self.mask = mask
+        # (mask, location) for each location of the fish, in the original order
+        self.entries = entries
+
+    @returns(list)
+    def locations(self, mask: int) -> list[dict]:
+        for entry_mask, location in self.entries:
+            if not entry_mask & mask:
+                continue
+            yield location
+
+
+class AvailabilityIndex:
+    """
+    Every (location key, variation, season, weather) combination in a data file is given a bit.
+
+    Bits are grouped by season, so that a season mask is a contiguous range:
+        bit = (season * len(slots) + slot) * len(WEATHERS) + weather
+    """
+
+    SEASONS = ('spring', 'summer', 'fall', 'winter')
+    WEATHERS = ('sunny', 'rainy')
+
+    ISLAND_PREFIX = 'Island'
+    WINTER = 'winter'
+    RAINY = 'rainy'
+
+    def __init__(self, fish: dict[str, dict]):
+        self._fish = fish
+
+    @cached_property
+    def _slots(self) -> dict[tuple[str, str], int]:
+        slots = {}
+        for fish in self._fish.values():
+            for location in fish['locations'] or ():
+                slots.setdefault((location['key'], location['variation']), len(slots))
+        return slots
+
+    def _bit(self, slot: int, season: str, weather: str) -> int:
+        season_i = self.SEASONS.index(season)
+        weather_i = self.WEATHERS.index(weather)
+        return 1 << ((season_i * len(self._slots) + slot) * len(self.WEATHERS) + weather_i)
+
+    def _mask(self, slots: list[int], seasons: tuple[str, ...], weathers: tuple[str, ...]) -> int:
+        mask = 0
+        for slot in slots:
+            for season in seasons:
+                for weather in weathers:
+                    mask |= self._bit(slot, season, weather)
+        return mask
+
+    @cached_property
+    @returns(dict)
+    def _season_masks(self) -> dict[str, int]:
+        slots = list(self._slots.values())
+        for season in self.SEASONS:
+            yield season, self._mask(slots, (season,), self.WEATHERS)
+
+    def season_mask(self, season: str) -> int:
+        return self._season_masks[season]
+
+    @returns(list)
+    def seasons(self, mask: int) -> list[str]:
+        for season, season_mask in self._season_masks.items():
+            if mask & season_mask:
+                yield season
+
+    def _fish_availability(self, fish: dict) -> FishAvailability:
+        weathers = tuple(fish['weather'])
+        mask = 0
+        entries = []
+        for location in fish['locations'] or ():
+            slot = self._slots[location['key'], location['variation']]
+            entry_mask = self._mask([slot], (location['season'],), weathers)
+            mask |= entry_mask
+            entries.append((entry_mask, location))
+        return FishAvailability(mask, entries)
+
+    @cached_property
+    @returns(dict)
+    def _availability(self) -> dict[str, FishAvailability]:
+        for fish_id, fish in self._fish.items():
+            yield fish_id, self._fish_availability(fish)
+
+    def __getitem__(self, fish_id: str) -> FishAvailability:
+        return self._availability[fish_id]
+
+    def config_mask(self, config: ConfigSnapshot) -> int:
+        """
+        Bits of unlocked areas.
+        Unless there is a rain totem, rainy winter is dropped outside of Ginger Island.
+        """
+        mask = 0
+        for (key, _), slot in self._slots.items():
+            if key not in config.unlocked_areas:
+                continue
+            mask |= self._mask([slot], self.SEASONS, self.WEATHERS)
+            if config.winter_rain_totem or key.startswith(self.ISLAND_PREFIX):
+                continue
+            mask &= ~self._bit(slot, self.WINTER, self.RAINY)
+        return mask
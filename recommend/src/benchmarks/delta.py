@@ -0,0 +1,129 @@
+"""
+Disk footprint and load time of versions stored as deltas versus complete data files,
+as the number of versions grows.
+
+    python -m benchmarks.delta --data-dir /data --versions 1 5 20 50
+
+Synthetic versions are made from the latest version by changing a few fish each,
+and are written both as complete data files of all languages and as deltas of the latest version,
+into a temporary directory.
+
+Load times are per version, with the cache of materialized versions cleared before every version,
+except for the last column.
+"""
+import json
+import os
+import random
+import tempfile
+import time
+import typing
+from argparse import ArgumentParser
+
+import delta
+import multilang
+from recommend import load_all_languages
+
+
+def base_data(data_dir: str) -> dict:
+    with open(os.path.join(data_dir, 'index.json')) as f:
+        index = json.load(f)
+    version = index['versions'][0]
+    all_languages = index.get('all_languages', {}).get(version)
+    if all_languages is not None:
+        return delta.load(os.path.join(data_dir, all_languages))
+
+    results = []
+    for data_file_name in index[version]:
+        with open(os.path.join(data_dir, data_file_name)) as f:
+            results.append(json.load(f))
+    return multilang.build(results)
+
+
+def synthetic_version(base: typing.Mapping, i: int, changes: int) -> dict:
+    """Changes the difficulty and drops the last location of `changes` fish, and removes one fish."""
+    rng = random.Random(i)
+    fish = dict(base['core'][multilang.FISH])
+    for fish_id in rng.sample(sorted(fish), changes + 1)[:-1]:
+        changed = fish[fish_id] = dict(fish[fish_id])
+        changed['difficulty'] += 1
+        if changed['locations']:
+            changed['locations'] = changed['locations'][:-1]
+    del fish[rng.choice(sorted(fish))]
+
+    return {
+        **base,
+        'version': f"{base['version']}.{i}",
+        'core': {multilang.FISH: fish},
+    }
+
+
+def write_json(path: str, data: typing.Mapping) -> int:
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    return os.path.getsize(path)
+
+
+def best_of(func: typing.Callable[[], typing.Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--data-dir', default='/data')
+    parser.add_argument('--versions', '-n', type=int, nargs='+', default=[1, 5, 20, 50])
+    parser.add_argument('--changes', '-c', type=int, default=5, help='Changed fish per version. Default: 5')
+    parser.add_argument('--repeat', '-r', type=int, default=5)
+    args = parser.parse_args(args)
+
+    base = base_data(args.data_dir)
+    header = (
+        f'{"versions":>8} | {"complete KiB":>12} | {"deltas KiB":>10} | '
+        f'{"complete ms":>11} | {"delta ms":>8} | {"cached ms":>9}'
+    )
+    print(f"{len(base['core'][multilang.FISH])} fish, {args.changes} changed per version")
+    print(header)
+    print('-' * len(header))
+
+    for count in args.versions:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_file = multilang.file_name(base['version'])
+            complete_size = delta_size = write_json(os.path.join(tmp_dir, base_file), base)
+            index = {'all_languages': {}, 'deltas': {}}
+            for i in range(1, count + 1):
+                version = synthetic_version(base, i, args.changes)
+                complete_file = f"{version['version']} (complete).json"
+                complete_size += write_json(os.path.join(tmp_dir, complete_file), version)
+                index['all_languages'][version['version']] = complete_file
+
+                delta_file = delta.file_name(version['version'])
+                delta.write(os.path.join(tmp_dir, delta_file), base, version, base_file)
+                delta_size += os.path.getsize(os.path.join(tmp_dir, delta_file))
+                index['deltas'][version['version']] = delta_file
+
+            versions = list(index['deltas'])
+            complete_index = {'all_languages': index['all_languages']}
+            delta_index = {'deltas': index['deltas']}
+
+            def load_versions(version_index: dict):
+                for version_name in versions:
+                    delta.cache_clear()
+                    load_all_languages(tmp_dir, version_index, version_name)
+
+            complete = best_of(lambda: load_versions(complete_index), args.repeat) / count
+            materialized = best_of(lambda: load_versions(delta_index), args.repeat) / count
+            # a version that was already materialized
+            cached = best_of(lambda: load_all_languages(tmp_dir, delta_index, versions[-1]), args.repeat)
+
+        print(
+            f'{count:>8} | {complete_size / 1024:>12.1f} | {delta_size / 1024:>10.1f} | '
+            f'{complete * 1000:>11.2f} | {materialized * 1000:>8.2f} | {cached * 1000:>9.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
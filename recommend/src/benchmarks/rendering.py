@@ -0,0 +1,72 @@
+"""
+Peak memory and time to the first row of RenderTable versus StreamingRenderTable,
+for a report of many profiles printed back to back.
+
+    python -m benchmarks.rendering -c ../config/recommend.conf --profiles 200
+
+Every profile is the --matrix table of the config.
+"""
+import gc
+import time
+import tracemalloc
+import typing
+from argparse import ArgumentParser
+
+from main import Main
+from rendering import RenderTable, StreamingRenderTable, column_widths
+
+
+def measure(render: typing.Callable[[], typing.Iterator[str]]) -> tuple[float, float, int]:
+    """Returns the time to the first line, the total time, and the peak memory."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    lines = render()
+    next(lines)
+    first = time.perf_counter() - start
+    for _ in lines:
+        pass
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, total, peak
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--config-file', '-c', default='../config/recommend.conf')
+    parser.add_argument('--profiles', '-p', type=int, default=200)
+    parser.add_argument('--verbose', '-v', action='store_true')
+    args = parser.parse_args(args)
+
+    report = Main(['--config-file', args.config_file, '--matrix'] + (['--verbose'] if args.verbose else []))
+    profile = list(report._rows)
+    formatters = report._formatters
+
+    def rows() -> typing.Iterator[dict]:
+        for _ in range(args.profiles):
+            yield from profile
+
+    schema = column_widths(rows(), formatters=formatters)
+
+    renderers = {
+        'RenderTable': lambda: iter(str(RenderTable(rows(), formatters=formatters)).split('\n')),
+        'streaming, schema': lambda: iter(StreamingRenderTable(rows(), widths=schema, formatters=formatters)),
+        'streaming, first pass': lambda: iter(StreamingRenderTable(
+            rows(),
+            widths=column_widths(rows(), formatters=formatters),
+            formatters=formatters,
+        )),
+    }
+
+    print(f'{args.profiles} profiles, {len(profile) * args.profiles} rows')
+    header = f'{"renderer":<24} | {"first row ms":>12} | {"total ms":>10} | {"peak KiB":>10}'
+    print(header)
+    print('-' * len(header))
+    for name, render in renderers.items():
+        first, total, peak = measure(render)
+        print(f'{name:<24} | {first * 1000:>12.1f} | {total * 1000:>10.1f} | {peak / 1024:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
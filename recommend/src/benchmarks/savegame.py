@@ -0,0 +1,158 @@
+"""
+Time and peak memory to read player progress from a save file, as the save grows.
+
+    python -m benchmarks.savegame --config-file ../config/recommend.conf --objects 1000 10000 100000
+
+Synthetic saves are written for the data file of the config:
+half of the fish have been caught, and about half of the fish of every bundle have been donated.
+Every farm has --objects placed objects, which make up most of a late-game save and are never read.
+
+Streaming with savegame.parse is compared to building the whole tree with ElementTree.parse,
+followed by progress cached in memory and in a StartupCache, and the config made of it.
+"""
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import typing
+from argparse import ArgumentParser
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+import savegame
+from config import Config
+from recommend import load_game_data
+from startup import StartupCache
+
+LOCATIONS_VISITED = (
+    'Farm', 'FarmHouse', 'Town', 'Forest', 'Beach', 'Mountain', 'Backwoods', 'BusStop',
+    'UndergroundMine1', 'UndergroundMine40', 'Desert', 'Woods', 'Sewer',
+)
+
+
+def synthetic_save(game_data: typing.Mapping, objects: int, *, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    fish_ids = sorted(game_data['fish'])
+    caught = rng.sample(fish_ids, len(fish_ids) // 2)
+    bundles: dict[str, list[str]] = {}
+    for fish_id, fish in game_data['fish'].items():
+        for bundle in fish['bundles'] or ():
+            bundles.setdefault(bundle['en_name'], []).append(fish_id)
+
+    def element(tag: str, *children: str, **attrs: str) -> str:
+        attrs = ''.join(f' {name.replace("__", ":")}="{value}"' for name, value in attrs.items())
+        return f'<{tag}{attrs}>{"".join(children)}</{tag}>'
+
+    def dictionary(tag: str, items: typing.Iterable[tuple[str, str]]) -> str:
+        return element(tag, *(element('item', element('key', key), element('value', value)) for key, value in items))
+
+    player = element(
+        'player',
+        element('name', 'Player'),
+        element('fishingLevel', str(rng.randint(0, 10))),
+        element('locationsVisited', *(element('string', name) for name in LOCATIONS_VISITED)),
+        dictionary('fishCaught', (
+            (element('int', fish_id), element('ArrayOfInt', element('int', '1'), element('int', '20')))
+            for fish_id in caught
+        )),
+    )
+    farm = element(
+        'GameLocation',
+        element('name', 'Farm'),
+        dictionary('objects', (
+            (
+                element('Vector2', element('X', str(i % 80)), element('Y', str(i // 80))),
+                element('Object', element('name', 'Stone'), element('parentSheetIndex', '450'), element('stack', '1')),
+            )
+            for i in range(objects)
+        )),
+        xsi__type='Farm',
+    )
+    community_center = element(
+        'GameLocation',
+        element('name', 'CommunityCenter'),
+        dictionary('bundles', (
+            (
+                element('int', str(index)),
+                element('ArrayOfBoolean', *(
+                    element('boolean', 'true' if rng.random() < 0.5 else 'false')
+                    for _ in members
+                )),
+            )
+            for index, members in enumerate(bundles.values())
+        )),
+        xsi__type='CommunityCenter',
+    )
+    bundle_data = dictionary('bundleData', (
+        (
+            element('string', f'Fish Tank/{index}'),
+            element('string', escape(f'{en_name}/O 685 30/{" ".join(f"{fish_id} 1 0" for fish_id in members)}/6/')),
+        )
+        for index, (en_name, members) in enumerate(bundles.items())
+    ))
+    return '<?xml version="1.0" encoding="utf-8"?>' + element(
+        'SaveGame',
+        player,
+        element('locations', farm, community_center),
+        bundle_data,
+        xmlns__xsi='http://www.w3.org/2001/XMLSchema-instance',
+        xmlns__xsd='http://www.w3.org/2001/XMLSchema',
+    )
+
+
+def measure(func: typing.Callable[[], typing.Any], repeat: int) -> tuple[float, int]:
+    """(best seconds, peak bytes) of `func`"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--config-file', '-c', default='../config/recommend.conf')
+    parser.add_argument('--objects', '-n', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', '-r', type=int, default=5)
+    args = parser.parse_args(args)
+
+    config = Config(args.config_file).snapshot
+    game_data = load_game_data(config.data_file, config.language)
+    header = (
+        f'{"objects":>8} | {"MB":>6} | {"stream ms":>9} | {"stream MB":>9} | {"tree ms":>8} | {"tree MB":>7} | '
+        f'{"cached ms":>9} | {"startup ms":>10} | {"config ms":>9}'
+    )
+    print(header)
+    print('-' * len(header))
+
+    for objects in args.objects:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_file = os.path.join(tmp_dir, 'Player_123456789')
+            with open(save_file, 'w') as f:
+                f.write(synthetic_save(game_data, objects))
+            startup_cache = StartupCache(os.path.join(tmp_dir, 'startup'))
+            savegame.load(save_file, startup_cache=startup_cache)
+
+            stream, stream_peak = measure(lambda: savegame.parse(save_file), args.repeat)
+            tree, tree_peak = measure(lambda: ElementTree.parse(save_file), args.repeat)
+            cached, _ = measure(lambda: savegame.load(save_file), args.repeat)
+            startup, _ = measure(lambda: savegame.load(save_file, startup_cache=startup_cache), args.repeat)
+            save = savegame.SaveGame(save_file)
+            make_config, _ = measure(lambda: save.config(config, game_data), args.repeat)
+            size = os.path.getsize(save_file)
+
+        print(
+            f'{objects:>8} | {size / 1024 / 1024:>6.1f} | {stream * 1000:>9.1f} | {stream_peak / 1024 / 1024:>9.1f} | '
+            f'{tree * 1000:>8.1f} | {tree_peak / 1024 / 1024:>7.1f} | {cached * 1000:>9.3f} | '
+            f'{startup * 1000:>10.2f} | {make_config * 1000:>9.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Latency and throughput of server.py under concurrent load.
+
+    python -m benchmarks.server --spawn --data-dir /data --config-dir ../config
+
+Without --spawn, a server must already be listening on --host/--port.
+"""
+import asyncio
+import itertools
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+
+from recommend import RecommendationGenerator
+
+
+class LoadGenerator:
+    def __init__(self, host: str, port: int, *, concurrency: int, requests: int, query: str):
+        self.host = host
+        self.port = port
+        self.concurrency = concurrency
+        self.requests = requests
+        self.query = query
+        self.latencies: list[float] = []
+
+    def _targets(self) -> itertools.cycle:
+        targets = []
+        for season in RecommendationGenerator.SEASONS:
+            for weather in RecommendationGenerator.WEATHERS:
+                targets.append(f'/recommend?season={season}&weather={weather}&{self.query}')
+        return itertools.cycle(targets)
+
+    async def _client(self, counter: itertools.count, targets: itertools.cycle):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while next(counter) < self.requests:
+                request = f'GET {next(targets)} HTTP/1.1\r\nHost: {self.host}\r\n\r\n'.encode()
+                start = time.perf_counter()
+                writer.write(request)
+                await writer.drain()
+
+                status_line = await reader.readline()
+                content_length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    if name.lower() == 'content-length':
+                        content_length = int(value)
+                await reader.readexactly(content_length)
+                self.latencies.append(time.perf_counter() - start)
+
+                if b' 200 ' not in status_line:
+                    raise RuntimeError(status_line.decode().strip())
+        finally:
+            writer.close()
+
+    async def run(self) -> float:
+        counter = itertools.count()
+        targets = self._targets()
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            self._client(counter, targets)
+            for _ in range(self.concurrency)
+        ))
+        return time.perf_counter() - start
+
+    def report(self, elapsed: float):
+        latencies = sorted(self.latencies)
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f'requests:    {len(latencies)}')
+        print(f'concurrency: {self.concurrency}')
+        print(f'throughput:  {len(latencies) / elapsed:.0f} req/s')
+        print(f'p50:         {quantiles[49] * 1000:.3f} ms')
+        print(f'p90:         {quantiles[89] * 1000:.3f} ms')
+        print(f'p99:         {quantiles[98] * 1000:.3f} ms')
+        print(f'max:         {latencies[-1] * 1000:.3f} ms')
+
+
+def wait_for_server(process: subprocess.Popen):
+    line = process.stdout.readline()
+    if not line.startswith('Serving on'):
+        raise RuntimeError(f'Server did not start: {line}')
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', '-c', type=int, default=200)
+    parser.add_argument('--requests', '-n', type=int, default=20000)
+    parser.add_argument(
+        '--query', '-q', default='top=10',
+        help="Added to every request after season and weather. Default: 'top=10'",
+    )
+    parser.add_argument(
+        '--spawn', action='store_true',
+        help='Start server.py for the duration of the benchmark.',
+    )
+    parser.add_argument('--data-dir', default='/data')
+    parser.add_argument('--config-dir', default='../config')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(args)
+
+    process = None
+    if args.spawn:
+        command = [
+            sys.executable, 'server.py',
+            '--host', args.host,
+            '--port', str(args.port),
+            '--data-dir', args.data_dir,
+            '--config-dir', args.config_dir,
+        ]
+        if args.workers is not None:
+            command += ['--workers', str(args.workers)]
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        wait_for_server(process)
+
+    try:
+        load = LoadGenerator(
+            args.host, args.port,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            query=args.query,
+        )
+        elapsed = asyncio.run(load.run())
+        load.report(elapsed)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Startup time and memory of loading game data from JSON files versus binary snapshots.
+
+    python -m benchmarks.snapshot --data-dir /data
+
+Snapshots next to the JSON files are used if prepare-data wrote them,
+otherwise they are written to a temporary directory first.
+"""
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import typing
+from argparse import ArgumentParser
+
+import snapshot
+from recommend import load_game_data
+
+
+def measure(func: typing.Callable[[], typing.Any], repeat: int) -> tuple[float, int]:
+    """Returns the best wall-clock time, and the memory retained by the result."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, retained
+
+
+def decode_all(game_data: typing.Mapping) -> typing.Mapping:
+    for _ in game_data['fish'].values():
+        pass
+    return game_data
+
+
+def data_files(data_dir: str) -> list[str]:
+    with open(os.path.join(data_dir, 'index.json')) as f:
+        index = json.load(f)
+    return [os.path.join(data_dir, file_name) for file_name in index[index['versions'][0]]]
+
+
+def snapshot_file(json_file: str, tmp_dir: str) -> str:
+    snapshot_file_name = snapshot.file_name(json_file)
+    if os.path.exists(snapshot_file_name):
+        return snapshot_file_name
+
+    snapshot_file_name = os.path.join(tmp_dir, os.path.basename(snapshot_file_name))
+    with open(json_file) as f:
+        snapshot.write(snapshot_file_name, json.load(f))
+    return snapshot_file_name
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--data-dir', default='/data')
+    parser.add_argument('--repeat', '-r', type=int, default=20)
+    args = parser.parse_args(args)
+
+    header = (
+        f'{"file":<32} | {"size":>8} | {"open ms":>8} | '
+        f'{"first fish ms":>13} | {"all fish ms":>11} | {"memory KiB":>10}'
+    )
+    print(header)
+    print('-' * len(header))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for json_file in data_files(args.data_dir):
+            bin_file = snapshot_file(json_file, tmp_dir)
+            for path in (json_file, bin_file):
+                open_time, _ = measure(lambda: load_game_data(path), args.repeat)
+                first_time, _ = measure(lambda: next(iter(load_game_data(path)['fish'].values())), args.repeat)
+                all_time, memory = measure(lambda: decode_all(load_game_data(path)), args.repeat)
+                print(
+                    f'{os.path.basename(path):<32} | {os.path.getsize(path):>8} | '
+                    f'{open_time * 1000:>8.3f} | {first_time * 1000:>13.3f} | {all_time * 1000:>11.3f} | '
+                    f'{memory / 1024:>10.1f}'
+                )
+
+
+if __name__ == '__main__':
+    main()
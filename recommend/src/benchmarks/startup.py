@@ -0,0 +1,153 @@
+"""
+Cold-start latency of the command line, in a new interpreter for every run.
+
+    python -m benchmarks.startup --config-file ../config/recommend.conf --output results.json --baseline db07bc3
+
+Without --config-file, synthetic game data of --fish fish is used.
+Every output format is timed without and with a startup cache (filled by a first run),
+as the best and median of --repeat runs, and compared to startup.BUDGET_MS['total'].
+With --baseline, the same runs of the code of a git revision are timed too, without a startup cache,
+alternating with the runs of this code; formats that the revision does not have are left out:
+
+    {
+        "python": ..., "season": ..., "weather": ..., "repeat": ..., "budget": ..., "baseline": ...,
+        "results": [{"format": ..., "seconds": ..., "cached_seconds": ..., "baseline_seconds": ...}, ...],
+    }
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+
+import main as main_module
+from benchmarks.synthetic import SyntheticGameData
+from main import Main
+from recommend import RecommendationGenerator
+from startup import BUDGET_MS, wall_times
+
+
+def run(args: list[str], repeat: int, env: dict[str, str] = None) -> dict[str, float]:
+    times = wall_times(args, repeat, env)
+    return {'best': min(times), 'median': statistics.median(times)}
+
+
+def checkout(revision: str, directory: str) -> str:
+    """Extracts the repository at `revision` into `directory`, returning its recommend/src/main.py."""
+    top_level = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel'],
+        cwd=os.path.dirname(os.path.abspath(main_module.__file__)),
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    archive = subprocess.run(['git', 'archive', revision], cwd=top_level, capture_output=True, check=True).stdout
+    subprocess.run(['tar', '-x', '-C', directory], input=archive, check=True)
+    return os.path.join(directory, 'recommend', 'src', 'main.py')
+
+
+def ms(seconds: dict[str, float] | None, key: str) -> str:
+    return '-' if seconds is None else f'{seconds[key] * 1000:.1f}'
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--config-file', '-c', default=None)
+    parser.add_argument('--fish', type=int, default=150, help='Synthetic fish without --config-file. Default: 150')
+    parser.add_argument('--season', choices=RecommendationGenerator.SEASONS, default='spring')
+    parser.add_argument('--weather', choices=RecommendationGenerator.WEATHERS, default='sunny')
+    parser.add_argument('--repeat', '-r', type=int, default=10)
+    parser.add_argument('--output', '-o', default=None, help='JSON file of the results. Default: only print them.')
+    parser.add_argument('--baseline', '-b', default=None, help='A git revision to compare with. Default: none.')
+    args = parser.parse_args(args)
+
+    budget = BUDGET_MS['total']
+    header = f'{"format":>12} | {"best ms":>8} | {"median ms":>9} | {"cached best":>11} | {"cached median":>13}'
+    if args.baseline is not None:
+        header += f' | {"baseline best":>13} | {"baseline median":>15}'
+    print(f'ms, {args.repeat} runs, budget {budget} ms' + (f', baseline {args.baseline}' if args.baseline else ''))
+    print(header)
+    print('-' * len(header))
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_file = args.config_file
+        if config_file is None:
+            config_file = SyntheticGameData(
+                fish=args.fish,
+                locations=17,
+                bundles=30,
+                characters=30,
+            ).write(os.path.join(tmp_dir, 'data'))
+
+        baseline_main = baseline_env = None
+        if args.baseline is not None:
+            baseline_dir = os.path.join(tmp_dir, 'baseline')
+            os.mkdir(baseline_dir)
+            baseline_main = checkout(args.baseline, baseline_dir)
+            baseline_env = {**os.environ, 'PYTHONPATH': os.path.join(baseline_dir, 'prepare-data', 'src')}
+
+        startup_cache = os.path.join(tmp_dir, 'startup')
+        for output_format in Main.FORMATS:
+            run_args = [
+                os.path.abspath(main_module.__file__),
+                '--config-file', config_file,
+                args.season,
+                args.weather,
+                '--format', output_format,
+            ]
+            cached_args = [*run_args, '--startup-cache', startup_cache]
+            # fill the startup cache
+            wall_times(cached_args, 1)
+
+            baseline_args = None
+            if baseline_main is not None:
+                baseline_args = [baseline_main, *run_args[1:]]
+                # also fails for a format that is not in the baseline
+                if subprocess.run(
+                        [sys.executable, *baseline_args], env=baseline_env, capture_output=True,
+                ).returncode != 0:
+                    baseline_args = None
+
+            # alternating, so that both see the same load of the machine
+            uncached_times, baseline_times = [], []
+            for _ in range(args.repeat):
+                uncached_times += wall_times(run_args, 1)
+                if baseline_args is not None:
+                    baseline_times += wall_times(baseline_args, 1, baseline_env)
+            uncached = {'best': min(uncached_times), 'median': statistics.median(uncached_times)}
+            baseline = None
+            if baseline_times:
+                baseline = {'best': min(baseline_times), 'median': statistics.median(baseline_times)}
+            cached = run(cached_args, args.repeat)
+
+            result = {'format': output_format, 'seconds': uncached, 'cached_seconds': cached}
+            if baseline_main is not None:
+                result['baseline_seconds'] = baseline
+            results.append(result)
+            print(
+                f'{output_format:>12} | {ms(uncached, "best"):>8} | {ms(uncached, "median"):>9} | '
+                f'{ms(cached, "best"):>11} | {ms(cached, "median"):>13}'
+                + (
+                    f' | {ms(baseline, "best"):>13} | {ms(baseline, "median"):>15}'
+                    if baseline_main is not None else ''
+                )
+                + (' !' if uncached['best'] * 1000 > budget else '')
+            )
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'season': args.season,
+                'weather': args.weather,
+                'repeat': args.repeat,
+                'budget': budget,
+                'baseline': args.baseline,
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
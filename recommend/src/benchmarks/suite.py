@@ -0,0 +1,140 @@
+"""
+Time of every stage of a recommendation on synthetic game data of growing size.
+
+    python -m benchmarks.suite --scales 100 1000 10000 --output results.json
+
+Every scale is a number of fish; locations, bundles and characters grow with it (see `scale`).
+Stages are timed separately, as the best of --repeat runs from scratch,
+and written to --output as JSON for regression tracking:
+
+    {"python": ..., "season": ..., "weather": ..., "repeat": ..., "results": [{"fish": ..., "seconds": {stage: ...}}]}
+
+Synthetic data needs prepare-data on the path, see benchmarks.synthetic:
+
+    PYTHONPATH=../../prepare-data/src python -m benchmarks.suite
+"""
+import json
+import platform
+import tempfile
+import time
+import typing
+from argparse import ArgumentParser
+from contextlib import contextmanager
+
+import snapshot
+from benchmarks.synthetic import SyntheticGameData
+from config import Config
+from main import Main
+from recommend import RecommendationGenerator, FishRecommendationScoreCalculator, load_game_data
+from rendering import RenderTable
+
+STAGES = (
+    'config',
+    'load',
+    'load_snapshot',
+    'factors',
+    'score',
+    'sort',
+    'top',
+    'render',
+)
+
+TOP = 10
+
+
+def scale(fish: int) -> dict[str, int]:
+    return {
+        'fish': fish,
+        'locations': max(17, fish // 30),
+        'bundles': max(30, fish // 20),
+        'characters': max(30, fish // 50),
+    }
+
+
+@contextmanager
+def timer(seconds: dict[str, float], stage: str) -> typing.Iterator[None]:
+    start = time.perf_counter()
+    yield
+    seconds[stage] = time.perf_counter() - start
+
+
+def run(config_file: str, season: str, weather: str) -> dict[str, float]:
+    seconds = {}
+
+    with timer(seconds, 'config'):
+        config = Config(config_file).snapshot
+
+    with timer(seconds, 'load'):
+        game_data = load_game_data(config.data_file)
+
+    with timer(seconds, 'load_snapshot'):
+        for _ in load_game_data(snapshot.file_name(config.data_file))['fish'].values():
+            pass
+
+    generator = RecommendationGenerator(config, game_data=game_data)
+    with timer(seconds, 'factors'):
+        for fish_factors in generator._fish_factors.values():
+            _ = fish_factors.score
+
+    day = generator.for_day(season, weather)
+    with timer(seconds, 'score'):
+        scores = []
+        for fish in day._fish.values():
+            score = FishRecommendationScoreCalculator(day, fish)
+            if score:
+                _ = score.score
+                scores.append(score)
+
+    with timer(seconds, 'sort'):
+        scores.sort(key=FishRecommendationScoreCalculator.sort_key)
+
+    with timer(seconds, 'top'):
+        list(generator.for_day(season, weather).get(top=TOP))
+
+    main = Main(['--config-file', config_file, season, weather, '--verbose'])
+    with timer(seconds, 'render'):
+        str(RenderTable((main._output_fish(score) for score in scores), formatters=main._formatters))
+
+    return seconds
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--scales', '-s', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--season', choices=RecommendationGenerator.SEASONS, default='spring')
+    parser.add_argument('--weather', choices=RecommendationGenerator.WEATHERS, default='sunny')
+    parser.add_argument('--repeat', '-r', type=int, default=3)
+    parser.add_argument('--output', '-o', default=None, help='JSON file of the results. Default: only print them.')
+    args = parser.parse_args(args)
+
+    header = f'{"fish":>6} | ' + ' | '.join(f'{stage:>13}' for stage in STAGES)
+    print(f'ms, best of {args.repeat}')
+    print(header)
+    print('-' * len(header))
+
+    results = []
+    for fish in args.scales:
+        sizes = scale(fish)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = SyntheticGameData(**sizes).write(tmp_dir)
+            best = {}
+            for _ in range(args.repeat):
+                for stage, seconds in run(config_file, args.season, args.weather).items():
+                    best[stage] = min(best.get(stage, float('inf')), seconds)
+
+        results.append({**sizes, 'seconds': best})
+        print(f'{fish:>6} | ' + ' | '.join(f'{best[stage] * 1000:>13.1f}' for stage in STAGES))
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'season': args.season,
+                'weather': args.weather,
+                'repeat': args.repeat,
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Game data at any scale, in the schema written by prepare-data, with a config to match,
+to benchmark modded games with many more fish, locations, bundles and characters than the game itself.
+
+    python -m benchmarks.synthetic --output-dir /tmp/synthetic --fish 10000 --locations 300
+
+Writes `<version> (English).json` and its snapshot, `index.json`, and `synthetic.conf`,
+which unlocks every location and needs every bundle and gift.
+The same arguments and --seed always write the same data.
+
+Needs `processors` and `utils` of prepare-data, which are mounted in the recommend container;
+elsewhere, run from recommend/src with PYTHONPATH=../../prepare-data/src.
+"""
+import json
+import os
+import random
+from argparse import ArgumentParser
+from functools import cached_property
+
+import snapshot
+from processors import t
+from utils import DataclassJSONWriter
+
+VERSION = '0.0.0'
+CONFIG_FILE_NAME = 'synthetic.conf'
+
+SEASONS = ('spring', 'summer', 'fall', 'winter')
+WEATHERS = (('sunny',), ('rainy',), ('sunny', 'rainy'))
+BEHAVIORS = ('mixed', 'dart', 'smooth', 'sinker', 'floater')
+TIME_RANGES = (
+    [(600, 2600)],
+    [(600, 1900)],
+    [(1800, 2600)],
+    [(600, 1200), (1800, 2600)],
+)
+ISLAND_PREFIX = 'Island'
+
+
+class SyntheticGameData:
+    def __init__(
+            self,
+            *,
+            fish: int,
+            locations: int,
+            bundles: int,
+            characters: int,
+            seed: int = 0,
+    ):
+        self.fish_count = fish
+        self.location_count = locations
+        self.bundle_count = bundles
+        self.character_count = characters
+        self._random = random.Random(seed)
+        # bundle or character -> fish ids, filled with the result
+        self._bundles: dict[str, list[str]] = {}
+        self._gifts: dict[str, list[str]] = {}
+
+    def _location_keys(self) -> list[str]:
+        # every tenth location is on the island, where it rains in winter without a totem
+        return [
+            f'{ISLAND_PREFIX if i % 10 == 9 else ""}Location{i}'
+            for i in range(self.location_count)
+        ]
+
+    def _locations(self) -> list[t.Location]:
+        locations = []
+        for i, key in enumerate(self._location_keys()):
+            # every fifth location has two variations, like the river and the pond of the forest
+            variations = ('0', '1') if i % 5 == 4 else ('-1',)
+            for variation in variations:
+                name = f'Location {i}' if variation == '-1' else f'Location {i} ({variation})'
+                for season in SEASONS:
+                    locations.append(t.Location(
+                        key=key,
+                        variation=variation,
+                        variation_orig=variation,
+                        name=name,
+                        season=season,
+                    ))
+        return locations
+
+    def _fish(self, i: int, locations: list[t.Location]) -> t.Fish:
+        rng = self._random
+        min_size = rng.randint(1, 30)
+        return t.Fish(
+            id=str(1000 + i),
+            en_name=f'Fish {i}',
+            name=f'Fish {i}',
+            time_ranges=rng.choice(TIME_RANGES),
+            weather=rng.choice(WEATHERS),
+            min_level=rng.randint(0, 10),
+            max_depth=rng.randint(2, 5),
+            spawn_multi=round(rng.uniform(0.1, 0.5), 2),
+            depth_multi=round(rng.uniform(0.1, 0.5), 2),
+            behavior=rng.choice(BEHAVIORS),
+            difficulty=rng.randint(15, 110),
+            size_range=(min_size, min_size + rng.randint(1, 60)),
+            locations=rng.sample(locations, rng.randint(1, min(6, len(locations)))),
+        )
+
+    @cached_property
+    def result(self) -> t.Result:
+        rng = self._random
+        locations = self._locations()
+        fish = [self._fish(i, locations) for i in range(self.fish_count)]
+
+        for i in range(self.bundle_count):
+            bundle = t.Bundle(en_name=f'Bundle {i}', name=f'Bundle {i}')
+            members = rng.sample(fish, min(4, len(fish)))
+            self._bundles[bundle.en_name] = [member.id for member in members]
+            for member in members:
+                if member.bundles is None:
+                    member.bundles = []
+                member.bundles.append(bundle)
+
+        for i in range(self.character_count):
+            character = t.Character(key=f'Character{i}', name=f'Character {i}')
+            members = rng.sample(fish, min(6, len(fish)))
+            self._gifts[character.key] = [member.id for member in members]
+            for preference_type, preference_members in (
+                    (t.Character.LOVES, members[:2]),
+                    (t.Character.LIKES, members[2:]),
+            ):
+                for member in preference_members:
+                    if member.gifts is None:
+                        member.gifts = {}
+                    member.gifts.setdefault(preference_type, []).append(character)
+
+        return t.Result(
+            version=VERSION,
+            lang_code=None,
+            language='English',
+            fish={member.id: member for member in fish},
+        )
+
+    def config(self, data_file: str) -> str:
+        """Unlocks every location, and needs every fish of every bundle and gift."""
+        _ = self.result
+
+        def option(name: str, values: list[str]) -> str:
+            return '\n'.join([f'{name} =', *(f'    {value}' for value in values)])
+
+        sections = {
+            'data': [
+                f'data_file = {data_file}',
+            ],
+            'progress': [
+                option('unlocked_areas', self._location_keys()),
+                'fishing_level = 10',
+                'winter_rain_totem = False',
+            ],
+            'recommendation': [
+                'season_factor = 1.0',
+                'weather_factor_sunny = 2.0',
+                'weather_factor_rainy = 5.0',
+                'bundle_factor = 5.0',
+                'gift_factor = 5.0',
+                'difficulty_factor = 0.1',
+            ],
+            'bundles': [
+                option('bundles', list(self._bundles)),
+                *(option(en_name.lower().replace(' ', '_'), fish_ids) for en_name, fish_ids in self._bundles.items()),
+            ],
+            'gifts': [
+                option(key.lower(), fish_ids) for key, fish_ids in self._gifts.items()
+            ],
+        }
+        return '\n\n'.join(
+            '\n'.join([f'[{section}]', *options])
+            for section, options in sections.items()
+        ) + '\n'
+
+    def write(self, output_dir: str) -> str:
+        """Returns the config file."""
+        os.makedirs(output_dir, exist_ok=True)
+        data_file_name = f'{VERSION} (English).json'
+        data_file = os.path.join(output_dir, data_file_name)
+        with open(data_file, 'w') as f:
+            DataclassJSONWriter(interned=(t.Location, t.Bundle, t.Character)).dump(self.result, f)
+        with open(data_file) as f:
+            snapshot.write(snapshot.file_name(data_file), json.load(f))
+
+        with open(os.path.join(output_dir, 'index.json'), 'w') as f:
+            json.dump({'versions': [VERSION], VERSION: [data_file_name]}, f)
+
+        config_file = os.path.join(output_dir, CONFIG_FILE_NAME)
+        with open(config_file, 'w') as f:
+            f.write(self.config(os.path.abspath(data_file)))
+        return config_file
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--output-dir', '-o', required=True)
+    parser.add_argument('--fish', type=int, default=10000)
+    parser.add_argument('--locations', type=int, default=300)
+    parser.add_argument('--bundles', type=int, default=500)
+    parser.add_argument('--characters', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(args)
+
+    config_file = SyntheticGameData(
+        fish=args.fish,
+        locations=args.locations,
+        bundles=args.bundles,
+        characters=args.characters,
+        seed=args.seed,
+    ).write(args.output_dir)
+    print(f'Wrote {args.fish} fish, config: {config_file}')
+
+
+if __name__ == '__main__':
+    main()
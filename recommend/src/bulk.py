@@ -0,0 +1,128 @@
+"""
+Recommendations of one day for many configs (player profiles), loading every data file once.
+"""
+import typing
+from itertools import repeat
+
+from cache import ResultCache
+from config import Config, ConfigSnapshot
+from recommend import RecommendationGenerator, FishRecommendationScoreCalculator
+
+
+class ProfileScores(typing.NamedTuple):
+    config: Config | ConfigSnapshot
+    scores: list[FishRecommendationScoreCalculator]
+
+
+class ProfileScorer:
+    """
+    Generators of one day for any config.
+    Configs of the same data file share its data, availability index and the fish that can appear on the day,
+    so only what depends on the config (unlocked areas, bundles, gifts, favorites and factors) is computed for each.
+    """
+
+    def __init__(
+            self,
+            season: str,
+            weather: str,
+            *,
+            generator_cls: typing.Type[RecommendationGenerator] = RecommendationGenerator,
+            cache: ResultCache = None,
+    ):
+        self.season = season
+        self.weather = weather
+        self.generator_cls = generator_cls
+        self.cache = cache
+        self._generators: dict[tuple[str, str | None], RecommendationGenerator] = {}
+
+    def generator(self, config: Config | ConfigSnapshot) -> RecommendationGenerator:
+        if isinstance(config, Config):
+            config = config.snapshot
+        key = config.data_file, config.language
+        generator = self._generators.get(key)
+        if generator is None:
+            generator = self._generators[key] = self.generator_cls(
+                config,
+                self.season,
+                self.weather,
+                cache=self.cache,
+            )
+            return generator
+        return generator.for_config(config)
+
+    def scores(
+            self,
+            config: Config | ConfigSnapshot,
+            *,
+            top: int = None,
+            min_score: float = None,
+    ) -> list[FishRecommendationScoreCalculator]:
+        return list(self.generator(config).get(top=top, min_score=min_score))
+
+
+# the scorer of a worker process of score_many
+_worker_scorer: ProfileScorer | None = None
+
+
+def _init_worker(season: str, weather: str, generator_cls: typing.Type[RecommendationGenerator]) -> None:
+    global _worker_scorer
+    _worker_scorer = ProfileScorer(season, weather, generator_cls=generator_cls)
+
+
+def _score_in_worker(
+        config_file: str,
+        top: int | None,
+        min_score: float | None,
+) -> list[tuple[str, dict[str, float]]]:
+    """(fish ID, factors) of every recommended fish, which is all that needs to be sent back."""
+    return [
+        (score.fish['id'], score.factors)
+        for score in _worker_scorer.scores(Config(config_file), top=top, min_score=min_score)
+    ]
+
+
+def score_many(
+        configs: typing.Iterable[Config | ConfigSnapshot],
+        season: str,
+        weather: str,
+        *,
+        top: int = None,
+        min_score: float = None,
+        jobs: int = 1,
+        generator_cls: typing.Type[RecommendationGenerator] = RecommendationGenerator,
+        cache: ResultCache = None,
+) -> typing.Iterator[ProfileScores]:
+    """
+    Recommendations for every config, in order, as soon as each one is scored.
+
+    With `jobs` > 1, configs are scored in that many processes, each loading the data once,
+    and must be Config files so that the processes can read them.
+    `cache` is only used without processes.
+    """
+    scorer = ProfileScorer(season, weather, generator_cls=generator_cls, cache=cache)
+    if jobs <= 1:
+        for config in configs:
+            yield ProfileScores(config, scorer.scores(config, top=top, min_score=min_score))
+        return
+
+    # processes are slow to import, and not needed for a single job
+    from concurrent.futures import ProcessPoolExecutor
+    configs = list(configs)
+    with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(season, weather, generator_cls),
+    ) as executor:
+        results = executor.map(
+            _score_in_worker,
+            [config.filename for config in configs],
+            repeat(top),
+            repeat(min_score),
+            chunksize=max(1, len(configs) // (jobs * 4)),
+        )
+        for config, scored in zip(configs, results):
+            generator = scorer.generator(config)
+            yield ProfileScores(config, [
+                FishRecommendationScoreCalculator.from_factors(generator, generator._fish[fish_id], factors)
+                for fish_id, factors in scored
+            ])
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import threading
+import typing
+from collections import OrderedDict
+
+# (fish ID, factors) of the appearing fish, in ranked order
+Result = list[tuple[str, dict[str, float]]]
+
+
+class CacheKey(typing.NamedTuple):
+    version: str
+    language: str
+    config_hash: str
+    season: str
+    weather: str
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(self).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache of scoring results, evicted by size, with an optional store on disk.
+
+    Everything is dropped when index.json changes, i.e. prepare-data published new data.
+    """
+
+    STAMP_FILE = 'index.stamp'
+
+    def __init__(self, index_file: str, *, max_bytes: int = 64 * 1024 * 1024, directory: str = None):
+        self.index_file = index_file
+        self.max_bytes = max_bytes
+        self.directory = directory
+
+        self._entries: OrderedDict[CacheKey, tuple[Result, int]] = OrderedDict()
+        self._bytes = 0
+        self._index_stamp = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    @staticmethod
+    def _get_stamp(index_file: str) -> str | None:
+        try:
+            stat = os.stat(index_file)
+        except FileNotFoundError:
+            return None
+        return f'{stat.st_mtime_ns} {stat.st_size}'
+
+    def _disk_path(self, key: CacheKey) -> str:
+        return os.path.join(self.directory, key.digest[:2], f'{key.digest}.json')
+
+    def _clear(self):
+        self._entries.clear()
+        self._bytes = 0
+        if self.directory is None:
+            return
+        for root, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                if file_name.endswith('.json'):
+                    os.remove(os.path.join(root, file_name))
+
+    def _validate(self):
+        """Drops every entry if index.json has changed since the cache was filled."""
+        stamp = self._get_stamp(self.index_file)
+        if stamp == self._index_stamp:
+            return
+
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            stamp_file = os.path.join(self.directory, self.STAMP_FILE)
+            try:
+                with open(stamp_file) as f:
+                    disk_stamp = f.read()
+            except FileNotFoundError:
+                disk_stamp = None
+            if disk_stamp != stamp:
+                self._clear()
+                with open(stamp_file, 'w') as f:
+                    f.write(stamp or '')
+        elif self._index_stamp is not None:
+            self._clear()
+
+        self._index_stamp = stamp
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def _put_memory(self, key: CacheKey, value: Result, size: int):
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = value, size
+        self._bytes += size
+        self._evict()
+
+    def _read_disk(self, key: CacheKey) -> tuple[Result, int] | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self._disk_path(key)) as f:
+                s = f.read()
+            data = json.loads(s)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # not UTF-8 or JSON, such as an entry cut short by a crash: a miss, replaced by the next put
+            return None
+        if data['key'] != list(key):
+            return None
+        return [tuple(item) for item in data['value']], len(s)
+
+    def get(self, key: CacheKey) -> Result | None:
+        with self._lock:
+            self._validate()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+            from_disk = self._read_disk(key)
+            if from_disk is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._put_memory(key, *from_disk)
+            return from_disk[0]
+
+    def put(self, key: CacheKey, value: Result) -> None:
+        s = json.dumps({'key': key, 'value': value})
+        with self._lock:
+            self._validate()
+            self._put_memory(key, value, len(s))
+            if self.directory is None:
+                return
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # written next to the entry and renamed, so that other processes never read part of an entry
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(s)
+            os.replace(tmp_path, path)
@@ -0,0 +1,279 @@
+import typing
+from functools import cached_property
+
+import numpy as np
+from returns import returns
+
+from cache import ResultCache
+from config import Config, ConfigSnapshot
+from recommend import RecommendationGenerator, FishFactors, FishRecommendationScoreCalculator
+
+
+class FishTable:
+    SEASONS = ('spring', 'summer', 'fall', 'winter')
+    WINTER = SEASONS.index('winter')
+
+    SUNNY = 'sunny'
+    RAINY = 'rainy'
+    WEATHERS = (SUNNY, RAINY)
+
+    ISLAND_PREFIX = 'Island'
+
+    def __init__(self, fish: dict[str, dict]):
+        self.fish = list(fish.values())
+
+    def __len__(self) -> int:
+        return len(self.fish)
+
+    @cached_property
+    @returns(list)
+    def ids(self) -> list[str]:
+        for fish in self.fish:
+            yield fish['id']
+
+    @cached_property
+    @returns(dict)
+    def _rows(self) -> dict[str, int]:
+        for row, fish_id in enumerate(self.ids):
+            yield fish_id, row
+
+    @cached_property
+    def _name_rank(self) -> np.ndarray:
+        _, rank = np.unique([fish['en_name'] for fish in self.fish], return_inverse=True)
+        return rank
+
+    @cached_property
+    def difficulty(self) -> np.ndarray:
+        return np.array([fish['difficulty'] for fish in self.fish], dtype=np.int64)
+
+    @cached_property
+    def min_level(self) -> np.ndarray:
+        return np.array([fish['min_level'] for fish in self.fish], dtype=np.int64)
+
+    @cached_property
+    def weather(self) -> np.ndarray:
+        result = np.zeros((len(self), len(self.WEATHERS)), dtype=bool)
+        for row, fish in enumerate(self.fish):
+            for weather in fish['weather']:
+                result[row, self.WEATHERS.index(weather)] = True
+        return result
+
+    @cached_property
+    def _weather_both(self) -> np.ndarray:
+        return np.array([len(fish['weather']) == 2 for fish in self.fish])
+
+    @cached_property
+    def _weather_sunny_first(self) -> np.ndarray:
+        return np.array([fish['weather'][0] == self.SUNNY for fish in self.fish])
+
+    @cached_property
+    @returns(list)
+    def location_keys(self) -> list[str]:
+        seen = set()
+        for fish in self.fish:
+            for location in fish['locations'] or ():
+                if location['key'] in seen:
+                    continue
+                seen.add(location['key'])
+                yield location['key']
+
+    @cached_property
+    def _island(self) -> np.ndarray:
+        return np.array([key.startswith(self.ISLAND_PREFIX) for key in self.location_keys], dtype=bool)
+
+    @cached_property
+    def locations(self) -> np.ndarray:
+        """fish x location key x season"""
+        keys = {key: i for i, key in enumerate(self.location_keys)}
+        result = np.zeros((len(self), len(keys), len(self.SEASONS)), dtype=bool)
+        for row, fish in enumerate(self.fish):
+            for location in fish['locations'] or ():
+                result[row, keys[location['key']], self.SEASONS.index(location['season'])] = True
+        return result
+
+    @cached_property
+    @returns(list)
+    def _bundle_items(self) -> list[tuple[int, str]]:
+        for row, fish in enumerate(self.fish):
+            for bundle in fish['bundles'] or ():
+                yield row, bundle['en_name']
+
+    @cached_property
+    def bundle_names(self) -> list[str]:
+        return list(dict.fromkeys(en_name for _, en_name in self._bundle_items))
+
+    @cached_property
+    def bundles(self) -> np.ndarray:
+        """fish x bundle"""
+        return self._bool_matrix(self._bundle_items, self.bundle_names)
+
+    @cached_property
+    @returns(list)
+    def _gift_items(self) -> list[tuple[int, str]]:
+        for row, fish in enumerate(self.fish):
+            for characters in (fish['gifts'] or {}).values():
+                for character in characters:
+                    yield row, character['key']
+
+    @cached_property
+    def character_keys(self) -> list[str]:
+        return list(dict.fromkeys(key for _, key in self._gift_items))
+
+    @cached_property
+    def gifts(self) -> np.ndarray:
+        """fish x character, any preference type"""
+        return self._bool_matrix(self._gift_items, self.character_keys)
+
+    def _bool_matrix(self, items: list[tuple[int, str]], columns: list[str]) -> np.ndarray:
+        col_index = {col: i for i, col in enumerate(columns)}
+        result = np.zeros((len(self), len(columns)), dtype=bool)
+        for row, col in items:
+            result[row, col_index[col]] = True
+        return result
+
+    def _select(self, columns: list[str], fish_ids: dict[str, list[str]]) -> np.ndarray:
+        result = np.zeros((len(self), len(columns)), dtype=bool)
+        for col, col_name in enumerate(columns):
+            for fish_id in fish_ids.get(col_name, ()):
+                row = self._rows.get(fish_id)
+                if row is None:
+                    continue
+                result[row, col] = True
+        return result
+
+    def _unlocked_seasons(self, config: ConfigSnapshot) -> np.ndarray:
+        """fish x season, mirrors FishFactors.available_seasons"""
+        unlocked = np.array([key in config.unlocked_areas for key in self.location_keys], dtype=bool)
+        locations = self.locations & unlocked[None, :, None]
+        if not config.winter_rain_totem:
+            skip = ~self._island[None, :] & ~self.weather[:, self.WEATHERS.index(self.SUNNY), None]
+            locations[:, :, self.WINTER] &= ~skip
+        return locations.any(axis=1)
+
+    def _season_factor(self, config: ConfigSnapshot, unlocked_seasons: np.ndarray) -> np.ndarray:
+        return config.rec_season_factor * (len(self.SEASONS) - unlocked_seasons.sum(axis=1))
+
+    def _weather_factor(self, config: ConfigSnapshot) -> np.ndarray:
+        return np.where(
+            self._weather_both,
+            0.0,
+            np.where(
+                self._weather_sunny_first,
+                config.rec_weather_factor_sunny,
+                config.rec_weather_factor_rainy,
+            ),
+        )
+
+    def _bundle_factor(self, config: ConfigSnapshot) -> np.ndarray:
+        fish_ids = {
+            en_name: config.bundle(en_name)
+            for en_name in self.bundle_names
+            if en_name in config.bundles
+        }
+        selected = self.bundles & self._select(self.bundle_names, fish_ids)
+        return np.where(selected.any(axis=1), config.rec_bundle_factor, 0.0)
+
+    def _gift_factor(self, config: ConfigSnapshot) -> np.ndarray:
+        fish_ids = {
+            character_key: config.gifts(character_key)
+            for character_key in self.character_keys
+        }
+        selected = self.gifts & self._select(self.character_keys, fish_ids)
+        return np.where(selected.any(axis=1), config.rec_gift_factor, 0.0)
+
+    def _difficulty_factor(self, config: ConfigSnapshot) -> np.ndarray:
+        # round each distinct difficulty in Python so the result is identical to the scalar calculator
+        values, inverse = np.unique(self.difficulty, return_inverse=True)
+        factors = np.array([round(int(value) * config.rec_difficulty_factor, 6) for value in values])
+        return factors[inverse]
+
+    def _favorite_factor(self, config: ConfigSnapshot) -> np.ndarray:
+        result = np.zeros(len(self))
+        for fish_id, favorite in config.favorites.items():
+            row = self._rows.get(fish_id)
+            if row is None:
+                continue
+            result[row] = favorite
+        return result
+
+    def score(self, config: ConfigSnapshot, season: str, weather: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the rows of appearing fish in ranked order,
+        and a fish x factor matrix in the order of FishFactors.FACTORS.
+        """
+        unlocked_seasons = self._unlocked_seasons(config)
+        appearing = (
+                (self.min_level <= config.fishing_level)
+                & self.weather[:, self.WEATHERS.index(weather)]
+                & unlocked_seasons[:, self.SEASONS.index(season)]
+        )
+
+        factors = np.stack([
+            self._season_factor(config, unlocked_seasons),
+            self._weather_factor(config),
+            self._bundle_factor(config),
+            self._gift_factor(config),
+            self._difficulty_factor(config),
+            self._favorite_factor(config),
+        ], axis=1)
+
+        # accumulate column by column to match the summation order of the scalar calculator
+        score = np.zeros(len(self))
+        for col in range(factors.shape[1]):
+            score = score + factors[:, col]
+
+        rows = np.flatnonzero(appearing)
+        order = np.lexsort((rows, self._name_rank[rows], -score[rows]))
+        return rows[order], factors
+
+
+class ColumnarRecommendationGenerator(RecommendationGenerator):
+    """
+    Computes the same ranked output as RecommendationGenerator with whole-array operations.
+
+    A FishTable may be shared between generators that use the same data file.
+    """
+
+    _DATA_SHARED = RecommendationGenerator._DATA_SHARED + (
+        '_table',
+    )
+    _SHARED = RecommendationGenerator._SHARED + (
+        '_table',
+    )
+
+    # scoring every fish at once is already cheaper than walking them one by one
+    _PRUNE = False
+
+    def __init__(
+            self,
+            config: Config | ConfigSnapshot,
+            season: str = None,
+            weather: str = None,
+            *,
+            game_data: typing.Mapping = None,
+            cache: ResultCache = None,
+            prune: bool = False,
+            table: FishTable = None,
+    ):
+        super().__init__(config, season, weather, game_data=game_data, cache=cache, prune=prune)
+        if table is not None:
+            self._table = table
+
+    @cached_property
+    def _table(self) -> FishTable:
+        return FishTable(self._fish)
+
+    @returns(dict)
+    def _factors(self, factors: np.ndarray) -> dict[str, float]:
+        for factor_name, factor_score in zip(FishFactors.FACTORS, factors.tolist()):
+            if factor_score == 0.0:
+                continue
+            yield factor_name, factor_score
+
+    @returns(list)
+    def _compute_scores(self) -> list[FishRecommendationScoreCalculator]:
+        rows, factors = self._table.score(self.config, self.season, self.weather)
+        for row in rows.tolist():
+            yield FishRecommendationScoreCalculator.from_factors(
+                self, self._table.fish[row], self._factors(factors[row]),
+            )
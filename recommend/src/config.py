@@ -1,5 +1,8 @@
-from configparser import ConfigParser
+import json
+import typing
+from configparser import ConfigParser, NoOptionError
 from functools import cached_property
+from types import MappingProxyType
 
 from returns import returns
 
@@ -27,6 +30,10 @@ class Config:
     def data_file(self) -> str:
         return self.parser.get('data', 'data_file')
 
+    @cached_property
+    def language(self) -> str | None:
+        return self.parser.get('data', 'language', fallback=None)
+
     @cached_property
     def unlocked_areas(self) -> str:
         return self.parser.getlist('progress', 'unlocked_areas')
@@ -81,3 +88,139 @@ class Config:
 
     def favorite(self, fish_id: str) -> float:
         return self.parser.getfloat('favorites', fish_id, fallback=0.0)
+
+    @returns(lambda items: MappingProxyType(dict(items)))
+    def _compile_lists(self, section: str, opt_names: typing.Iterable[str]) -> typing.Mapping[str, frozenset[str]]:
+        for opt_name in opt_names:
+            yield opt_name, frozenset(self.parser.getlist(section, opt_name))
+
+    @returns(lambda items: MappingProxyType(dict(items)))
+    def _compile_favorites(self) -> typing.Mapping[str, float]:
+        if not self.parser.has_section('favorites'):
+            return
+        for fish_id in self.parser.options('favorites'):
+            yield fish_id, self.parser.getfloat('favorites', fish_id)
+
+    def _opt_names(self, section: str) -> list[str]:
+        if not self.parser.has_section(section):
+            return []
+        return self.parser.options(section)
+
+    @cached_property
+    def snapshot(self) -> 'ConfigSnapshot':
+        return ConfigSnapshot(
+            data_file=self.data_file,
+            language=self.language,
+            unlocked_areas=frozenset(self.unlocked_areas),
+            fishing_level=self.fishing_level,
+            winter_rain_totem=self.winter_rain_totem,
+            rec_season_factor=self.rec_season_factor,
+            rec_weather_factor_sunny=self.rec_weather_factor_sunny,
+            rec_weather_factor_rainy=self.rec_weather_factor_rainy,
+            rec_bundle_factor=self.rec_bundle_factor,
+            rec_gift_factor=self.rec_gift_factor,
+            rec_difficulty_factor=self.rec_difficulty_factor,
+            bundles=frozenset(self.bundles),
+            bundle_contents=self._compile_lists('bundles', self._opt_names('bundles')),
+            gift_lists=self._compile_lists('gifts', self._opt_names('gifts')),
+            favorites=self._compile_favorites(),
+        )
+
+
+class ConfigSnapshot:
+    """
+    Every value of a config file, parsed once, and immutable.
+
+    Has the same interface as Config,
+    and raises the same NoOptionError for bundles and characters without an option.
+    Snapshots with the same content are equal and have the same content_hash across runs,
+    which is only computed when it is needed (result caches, server, --config-dir).
+
+    A plain class instead of a dataclass, as it is created on every start of the command line.
+    """
+
+    data_file: str
+    language: str | None
+
+    unlocked_areas: frozenset[str]
+    fishing_level: int
+    winter_rain_totem: bool
+
+    rec_season_factor: float
+    rec_weather_factor_sunny: float
+    rec_weather_factor_rainy: float
+    rec_bundle_factor: float
+    rec_gift_factor: float
+    rec_difficulty_factor: float
+
+    bundles: frozenset[str]
+    # option name -> fish IDs
+    bundle_contents: typing.Mapping[str, frozenset[str]]
+    gift_lists: typing.Mapping[str, frozenset[str]]
+    # fish ID -> points
+    favorites: typing.Mapping[str, float]
+
+    FIELDS = tuple(__annotations__)
+    __slots__ = FIELDS + ('_content_hash',)
+
+    def __init__(self, **values):
+        """Every one of FIELDS, by name."""
+        if values.keys() != set(self.FIELDS):
+            raise TypeError(f'{self.__class__.__name__} needs exactly these values: {", ".join(self.FIELDS)}')
+        for name in self.FIELDS:
+            object.__setattr__(self, name, values[name])
+        object.__setattr__(self, '_content_hash', None)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f'{self.__class__.__name__} cannot be modified; use replace()')
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)})'
+
+    def asdict(self) -> dict[str, typing.Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def replace(self, **changes) -> 'ConfigSnapshot':
+        return self.__class__(**{**self.asdict(), **changes})
+
+    @staticmethod
+    def _canonical(value):
+        if isinstance(value, frozenset):
+            return sorted(value)
+        if isinstance(value, typing.Mapping):
+            return {key: ConfigSnapshot._canonical(val) for key, val in sorted(value.items())}
+        return value
+
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            import hashlib
+            content = {name: self._canonical(value) for name, value in self.asdict().items()}
+            content_hash = hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+            object.__setattr__(self, '_content_hash', content_hash)
+        return self._content_hash
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ConfigSnapshot):
+            return NotImplemented
+        return self.content_hash == other.content_hash
+
+    def __hash__(self) -> int:
+        return hash(self.content_hash)
+
+    @staticmethod
+    def _get_list(lists: typing.Mapping[str, frozenset[str]], section: str, name: str) -> frozenset[str]:
+        opt_name = Config._get_opt_name(name)
+        try:
+            return lists[opt_name]
+        except KeyError:
+            raise NoOptionError(opt_name, section) from None
+
+    def bundle(self, en_name: str) -> frozenset[str]:
+        return self._get_list(self.bundle_contents, 'bundles', en_name)
+
+    def gifts(self, character_key: str) -> frozenset[str]:
+        return self._get_list(self.gift_lists, 'gifts', character_key)
+
+    def favorite(self, fish_id: str) -> float:
+        return self.favorites.get(fish_id, 0.0)
@@ -0,0 +1,179 @@
+"""
+Flat export of every (language, fish, location, season, weather, hours) fact of a version,
+for analysis outside of this project.
+
+    python export.py --data-dir /data --output-dir /data/export
+
+Writes `<version> (facts).csv` and `<version> (facts).npz`.
+In the npz file, every string column is dictionary-encoded:
+`<column>` holds int32 codes into `<column>.values`; see `load`.
+"""
+import csv
+import json
+import os
+import typing
+from argparse import ArgumentParser
+from functools import cached_property
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        'export.py requires numpy, which can be installed with `pip install -r ../requirements/numpy.txt`'
+    ) from e
+
+from recommend import Names, load_all_languages
+
+
+class Dictionary:
+    def __init__(self):
+        self._codes: dict[str, int] = {}
+        self.codes: list[int] = []
+
+    def append(self, value: str) -> None:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._codes)
+        self.codes.append(code)
+
+    @property
+    def values(self) -> list[str]:
+        return list(self._codes)
+
+
+class FactTable:
+    STRING_COLUMNS = (
+        'language',
+        'fish_id',
+        'fish_en_name',
+        'fish_name',
+        'location_key',
+        'location_name',
+        'season',
+        'weather',
+    )
+    INT_COLUMNS = (
+        'variation',
+        'start_time',
+        'end_time',
+    )
+    # column order of the CSV file
+    COLUMNS = (
+        'language',
+        'fish_id',
+        'fish_en_name',
+        'fish_name',
+        'location_key',
+        'variation',
+        'location_name',
+        'season',
+        'weather',
+        'start_time',
+        'end_time',
+    )
+
+    def __init__(self):
+        self._strings = {column: Dictionary() for column in self.STRING_COLUMNS}
+        self._ints: dict[str, list[int]] = {column: [] for column in self.INT_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self._ints['start_time'])
+
+    def _append(self, **row):
+        for column, dictionary in self._strings.items():
+            dictionary.append(row[column])
+        for column, values in self._ints.items():
+            values.append(row[column])
+
+    def add(self, game_data: typing.Mapping) -> None:
+        names = Names.of(game_data)
+        language = game_data['language']
+        for fish in game_data['fish'].values():
+            fish_name = names.fish(fish)
+            for location in fish['locations'] or ():
+                location_name = names.location(location)
+                for weather in fish['weather']:
+                    for start_time, end_time in fish['time_ranges']:
+                        self._append(
+                            language=language,
+                            fish_id=fish['id'],
+                            fish_en_name=fish['en_name'],
+                            fish_name=fish_name,
+                            location_key=location['key'],
+                            variation=int(location['variation']),
+                            location_name=location_name,
+                            season=location['season'],
+                            weather=weather,
+                            start_time=start_time,
+                            end_time=end_time,
+                        )
+
+    @cached_property
+    def arrays(self) -> dict[str, np.ndarray]:
+        arrays = {}
+        for column, dictionary in self._strings.items():
+            arrays[column] = np.array(dictionary.codes, dtype=np.int32)
+            arrays[f'{column}.values'] = np.array(dictionary.values, dtype=str)
+        for column, values in self._ints.items():
+            arrays[column] = np.array(values, dtype=np.int16)
+        return arrays
+
+    def write_npz(self, path: str) -> None:
+        np.savez_compressed(path, **self.arrays)
+
+    def write_csv(self, path: str) -> None:
+        columns = decode(self.arrays)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            writer.writerows(zip(*(columns[column].tolist() for column in self.COLUMNS)))
+
+
+def decode(arrays: typing.Mapping[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Replaces the codes of every dictionary-encoded column with its values."""
+    columns = {}
+    for column, array in arrays.items():
+        if column.endswith('.values'):
+            continue
+        values = arrays.get(f'{column}.values')
+        columns[column] = array if values is None else values[array]
+    return columns
+
+
+def load(path: str, *, decoded: bool = False) -> dict[str, np.ndarray]:
+    """Reads every column of an npz export at once."""
+    with np.load(path) as npz:
+        arrays = {column: npz[column] for column in npz.files}
+    if decoded:
+        return decode(arrays)
+    return arrays
+
+
+def file_name(version: str, ext: str) -> str:
+    return f'{version} (facts).{ext}'
+
+
+def main(args=None):
+    parser = ArgumentParser(description='Export the availability of every fish in every language as flat files.')
+    parser.add_argument('--data-dir', default='/data')
+    parser.add_argument('--output-dir', '-o', default=None, help='Default: --data-dir')
+    parser.add_argument('--version', default=None, help='Default: the latest version in index.json')
+    args = parser.parse_args(args)
+
+    with open(os.path.join(args.data_dir, 'index.json')) as f:
+        index = json.load(f)
+    version = args.version or index['versions'][0]
+    output_dir = args.output_dir or args.data_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    table = FactTable()
+    for game_data in load_all_languages(args.data_dir, index, version):
+        table.add(game_data)
+
+    table.write_csv(os.path.join(output_dir, file_name(version, 'csv')))
+    table.write_npz(os.path.join(output_dir, file_name(version, 'npz')))
+    print(f'Exported {len(table)} facts of {version}')
+
+
+if __name__ == '__main__':
+    main()
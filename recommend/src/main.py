@@ -1,42 +1,110 @@
+import io
 import json
+import os
+import sys
+import time
 import typing
 from argparse import ArgumentParser
+from contextlib import redirect_stdout
 from functools import cached_property
-from pprint import pprint
 
 from returns import returns
 
-from config import Config
-from recommend import RecommendationGenerator, FishRecommendationScoreCalculator
-from rendering import RenderTable
+from config import Config, ConfigSnapshot
+from recommend import RecommendationGenerator, FishRecommendationScoreCalculator, load_game_data
+from rendering import RenderTable, column_widths
+
+if typing.TYPE_CHECKING:
+    from cache import ResultCache
+    from planner import PlanDay
+    from rendering import StreamingRenderTable
+    from serializer import RecordSerializer
+    from startup import StartupCache
 
 
 class Main:
+    PROG = 'main.py'
     _parser = None
 
     FORMAT_TABLE = 'table'
     FORMAT_PPRINT = 'pprint'
     FORMAT_JSON = 'json'
+    FORMAT_JSON_COMPACT = 'json-compact'
+    FORMAT_NDJSON = 'ndjson'
+    FORMATS = (
+        FORMAT_TABLE,
+        FORMAT_PPRINT,
+        FORMAT_JSON,
+        FORMAT_JSON_COMPACT,
+        FORMAT_NDJSON,
+    )
+
+    CONFIG_EXT = '.conf'
+
+    ENGINE_PYTHON = 'python'
+    ENGINE_NUMPY = 'numpy'
+
+    @classmethod
+    def _add_arguments(cls, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            'season', choices=RecommendationGenerator.SEASONS, nargs='?',
+            help='Season',
+        )
+        parser.add_argument(
+            'weather', choices=RecommendationGenerator.WEATHERS, nargs='?',
+            help='Weather',
+        )
+        parser.add_argument(
+            '--matrix', action='store_true',
+            help='Recommend for every combination of season and weather in one run, '
+                 'instead of specifying season and weather.',
+        )
+
+        parser.add_argument(
+            '--config-dir', default=None,
+            help='Recommend for every *.conf file in this directory (player profiles), instead of --config-file, '
+                 'loading every data file once. Rows are labeled with the name of their profile.',
+        )
+        parser.add_argument(
+            '--jobs', '-j', type=int, default=1,
+            help='With --config-dir, number of processes that score profiles. Default: 1',
+        )
+
+        parser.add_argument(
+            '--engine', '-e', choices=(cls.ENGINE_PYTHON, cls.ENGINE_NUMPY), default=cls.ENGINE_PYTHON,
+            help=f'Scoring engine. '
+                 f'{cls.ENGINE_NUMPY!r} scores all fish with whole-array operations and requires numpy. '
+                 f'Default: {cls.ENGINE_PYTHON}.',
+        )
+        parser.add_argument(
+            '--cache-dir', default=None,
+            help='Keep scoring results in this directory and reuse them on later runs. '
+                 'Cleared whenever index.json next to the data file changes. '
+                 'Default: no cache.',
+        )
 
     @classmethod
     def parser(cls) -> ArgumentParser:
         if cls._parser is not None:
             return cls._parser
 
-        parser = ArgumentParser()
+        parser = ArgumentParser(prog=cls.PROG)
         parser.add_argument(
             '--config-file', '-c', default='../config/recommend.conf',
             help="Specify a configuration file. Default: '../config/recommend.conf'",
         )
-
         parser.add_argument(
-            'season', choices=('spring', 'summer', 'fall', 'winter'),
-            help='Season',
+            '--startup-cache', default=None,
+            help='Keep the parsed config file and data file in this directory '
+                 'and reuse them while the files are unchanged, for a faster start. '
+                 'Default: no cache.',
         )
         parser.add_argument(
-            'weather', choices=('sunny', 'rainy'),
-            help='Weather',
+            '--save-file', default=None,
+            help='Read fishing level, visited areas, bundles and caught fish from this Stardew Valley save file, '
+                 'instead of the progress, bundles and gifts of the config file.',
         )
+
         parser.add_argument(
             '--top', '-n', type=int, default=None,
             help='Only display top n items. '
@@ -55,44 +123,209 @@ class Main:
         )
 
         parser.add_argument(
-            '--format', '-f', choices=(cls.FORMAT_TABLE, cls.FORMAT_PPRINT, cls.FORMAT_JSON), default=cls.FORMAT_TABLE,
-            help=f'Output format. Default: {cls.FORMAT_TABLE}.',
+            '--format', '-f', choices=cls.FORMATS, default=cls.FORMAT_TABLE,
+            help=f'Output format. '
+                 f'{cls.FORMAT_JSON_COMPACT!r} prints one JSON document on a single line, '
+                 f'{cls.FORMAT_NDJSON!r} prints one JSON object per fish and line. '
+                 f'Default: {cls.FORMAT_TABLE}.',
+        )
+        parser.add_argument(
+            '--fields', default=None,
+            help=f'Comma-separated columns to output, e.g. ID,Name,Score. '
+                 f'Other columns are not computed. '
+                 f'Choose from: {", ".join(FishRecommendationScoreCalculator.FIELDS)}. '
+                 f'Default: every column of the normal or --verbose output.',
+        )
+        parser.add_argument(
+            '--stream', action='store_true',
+            help=f'Print {cls.FORMAT_TABLE!r} rows as soon as they are rendered, instead of keeping all of them. '
+                 f'Column widths are measured in a first pass, so every row is rendered twice.',
         )
+
+        cls._add_arguments(parser)
         cls._parser = parser
         return parser
 
     config_file: str
 
-    season: str
-    weather: str
+    season: str | None
+    weather: str | None
+    matrix: bool
     top: int | None
     min_score: float | None
 
     verbose: bool
     format: str
+    fields: str | None
+    stream: bool
+    engine: str
+    cache_dir: str | None
+    startup_cache: str | None
+    save_file: str | None
+    config_dir: str | None
+    jobs: int
 
     def __init__(self, args=None):
-        self._args = self.parser().parse_args(args)
+        parser = self.parser()
+        self._args = parser.parse_args(args)
+        self._validate(parser)
+        if self._fields == []:
+            parser.error('--fields needs at least one field')
+        for field in self._fields or ():
+            if field not in FishRecommendationScoreCalculator.FIELDS:
+                parser.error(f'invalid field in --fields: {field!r}')
+
+    def _validate(self, parser: ArgumentParser) -> None:
+        if self.matrix:
+            if self.season is not None or self.weather is not None:
+                parser.error('season and weather cannot be used with --matrix')
+        elif self.season is None or self.weather is None:
+            parser.error('season and weather are required unless --matrix is used')
+        if self.engine == self.ENGINE_NUMPY:
+            import importlib.util
+            if importlib.util.find_spec('numpy') is None:
+                parser.error(f'--engine {self.ENGINE_NUMPY} requires numpy, '
+                             f'which can be installed with `pip install -r ../requirements/numpy.txt`')
+        if self.config_dir is not None:
+            if self.matrix:
+                parser.error('--config-dir cannot be used with --matrix')
+            if self.save_file is not None:
+                parser.error('--config-dir cannot be used with --save-file')
+            if not self._profiles:
+                parser.error(f'no {self.CONFIG_EXT} files in --config-dir')
 
     def __getattr__(self, arg: str):
         return getattr(self._args, arg)
 
     @cached_property
-    def _config(self) -> Config:
+    def _startup_cache(self) -> 'StartupCache | None':
+        if self.startup_cache is None:
+            return None
+        from startup import StartupCache
+        return StartupCache(self.startup_cache)
+
+    @cached_property
+    def _file_config(self) -> Config | ConfigSnapshot:
+        if self.config_dir is not None:
+            return next(iter(self._profiles.values()))
+        if self._startup_cache is not None:
+            return self._startup_cache.config(self.config_file)
         return Config(self.config_file)
 
+    @cached_property
+    def _config(self) -> Config | ConfigSnapshot:
+        if self.save_file is None:
+            return self._file_config
+        from savegame import SaveGame
+        return SaveGame(self.save_file, startup_cache=self._startup_cache).config(self._file_config, self._game_data)
+
+    @cached_property
+    def _game_data(self) -> typing.Mapping | None:
+        """Loaded through the startup cache or for the save file, otherwise left to the generator."""
+        if self._startup_cache is None and self.save_file is None:
+            return None
+        config = self._file_config
+        return load_game_data(config.data_file, config.language, startup_cache=self._startup_cache)
+
+    @cached_property
+    @returns(dict)
+    def _profiles(self) -> dict[str, Config]:
+        """Profile name -> config of --config-dir"""
+        import glob
+        for config_file in sorted(glob.glob(os.path.join(self.config_dir, f'*{self.CONFIG_EXT}'))):
+            yield os.path.basename(config_file)[:-len(self.CONFIG_EXT)], Config(config_file)
+
+    @cached_property
+    def _cache(self) -> 'ResultCache | None':
+        if self.cache_dir is None:
+            return None
+        from cache import ResultCache
+        index_file = os.path.join(os.path.dirname(self._config.data_file), 'index.json')
+        return ResultCache(index_file, directory=self.cache_dir)
+
+    @property
+    def _generator_cls(self) -> typing.Type[RecommendationGenerator]:
+        if self.engine == self.ENGINE_NUMPY:
+            from columnar import ColumnarRecommendationGenerator
+            return ColumnarRecommendationGenerator
+        return RecommendationGenerator
+
     @cached_property
     def _recommend_gen(self) -> RecommendationGenerator:
-        return RecommendationGenerator(self._config, self.season, self.weather)
+        return self._generator_cls(
+            self._config,
+            self.season,
+            self.weather,
+            game_data=self._game_data,
+            cache=self._cache,
+        )
+
+    @property
+    def _profile_data(self) -> typing.Iterator[tuple[str, list[FishRecommendationScoreCalculator]]]:
+        """(profile name, recommendations) of every profile of --config-dir, as soon as it is scored"""
+        from bulk import score_many
+        profiles = score_many(
+            self._profiles.values(),
+            self.season,
+            self.weather,
+            top=self.top,
+            min_score=self.min_score,
+            jobs=self.jobs,
+            generator_cls=self._generator_cls,
+            cache=self._cache,
+        )
+        for name, profile in zip(self._profiles, profiles):
+            yield name, profile.scores
 
     @property
     def _data(self) -> typing.Iterator[FishRecommendationScoreCalculator]:
         return self._recommend_gen.get(top=self.top, min_score=self.min_score)
 
+    @cached_property
+    def _fields(self) -> list[str] | None:
+        if self.fields is None:
+            return None
+        return [field.strip() for field in self.fields.split(',') if field.strip()]
+
+    def _output_fish(self, fish: FishRecommendationScoreCalculator) -> dict:
+        return fish.output(verbose=self.verbose, table=self.format == self.FORMAT_TABLE, fields=self._fields)
+
     @property
     def _output(self) -> typing.Iterator[dict]:
         for fish in self._data:
-            yield fish.output(verbose=self.verbose, table=self.format == self.FORMAT_TABLE)
+            yield self._output_fish(fish)
+
+    @property
+    def _matrix(self) -> dict[tuple[str, str], list[FishRecommendationScoreCalculator]]:
+        return self._recommend_gen.matrix(top=self.top, min_score=self.min_score)
+
+    @property
+    def _fish_rows(self) -> typing.Iterator[tuple[dict, FishRecommendationScoreCalculator]]:
+        """(fields in front of the fish, fish) of every row"""
+        if self.config_dir is not None:
+            for name, data in self._profile_data:
+                for fish in data:
+                    yield {'Profile': name}, fish
+            return
+
+        if not self.matrix:
+            for fish in self._data:
+                yield {}, fish
+            return
+
+        for (season, weather), data in self._matrix.items():
+            for fish in data:
+                yield {'Season': season, 'Weather': weather}, fish
+
+    @property
+    @returns(dict)
+    def _matrix_output_nested(self) -> dict[str, dict[str, list[dict]]]:
+        matrix = self._matrix
+        for season in RecommendationGenerator.SEASONS:
+            yield season, {
+                weather: [self._output_fish(fish) for fish in matrix[season, weather]]
+                for weather in RecommendationGenerator.WEATHERS
+            }
 
     @staticmethod
     @returns(list)
@@ -124,29 +357,334 @@ class Main:
         yield 'Loved by', self._format_translatable_names_verbose
         yield 'Liked by', self._format_translatable_names_verbose
 
+    def _rows_of(
+            self,
+            fish_rows: typing.Iterable[tuple[dict, FishRecommendationScoreCalculator]],
+    ) -> typing.Iterator[dict]:
+        for fields, fish in fish_rows:
+            yield {**fields, **self._output_fish(fish)}
+
+    @property
+    def _rows(self) -> typing.Iterator[dict]:
+        """Rows of the table format"""
+        return self._rows_of(self._fish_rows)
+
+    @property
+    def _document(self) -> dict | list | None:
+        """Printed as a whole by the pprint and json formats, or `None` to print every fish on its own."""
+        if self.matrix:
+            return self._matrix_output_nested
+        if self.config_dir is not None:
+            return {
+                name: [self._output_fish(fish) for fish in data]
+                for name, data in self._profile_data
+            }
+        return None
+
     @cached_property
     def _table_renderer(self) -> RenderTable:
         return RenderTable(
-            self._output,
+            self._rows,
+            formatters=self._formatters,
+        )
+
+    @property
+    def _streaming_table_renderer(self) -> 'StreamingRenderTable':
+        from rendering import StreamingRenderTable
+        # the widths need every row before the first one is printed:
+        # fish are scored once and kept, and only their rows are rendered twice
+        fish_rows = list(self._fish_rows)
+        return StreamingRenderTable(
+            self._rows_of(fish_rows),
+            widths=column_widths(self._rows_of(fish_rows), formatters=self._formatters),
             formatters=self._formatters,
         )
 
     def _pprint(self):
+        from pprint import pprint
+        document = self._document
+        if document is not None:
+            pprint(document)
+            return
+
         for item in self._output:
             pprint(item)
 
     def _print_json(self):
+        document = self._document
+        if document is not None:
+            print(json.dumps(document, indent=2))
+            return
+
         for item in self._output:
             print(json.dumps(item, indent=2))
 
+    @cached_property
+    def _serializer(self) -> 'RecordSerializer':
+        from serializer import RecordSerializer
+        return RecordSerializer(verbose=self.verbose, fields=self._fields)
+
+    def _print_json_compact(self):
+        document = self._document
+        if document is not None:
+            sys.stdout.write(self._serializer.encode(document) + '\n')
+            return
+
+        sys.stdout.write('[')
+        for i, (fields, fish) in enumerate(self._fish_rows):
+            if i:
+                sys.stdout.write(',')
+            sys.stdout.write(self._serializer(fish, fields))
+        sys.stdout.write(']\n')
+
+    def _print_ndjson(self):
+        sys.stdout.writelines(
+            self._serializer(fish, fields) + '\n'
+            for fields, fish in self._fish_rows
+        )
+
     def __call__(self):
-        if self.format == self.FORMAT_TABLE:
+        if self.format == self.FORMAT_TABLE and self.stream:
+            for line in self._streaming_table_renderer:
+                print(line)
+        elif self.format == self.FORMAT_TABLE:
             print(self._table_renderer)
         elif self.format == self.FORMAT_PPRINT:
             self._pprint()
         elif self.format == self.FORMAT_JSON:
             self._print_json()
+        elif self.format == self.FORMAT_JSON_COMPACT:
+            self._print_json_compact()
+        elif self.format == self.FORMAT_NDJSON:
+            self._print_ndjson()
+
+
+class PlanMain(Main):
+    PROG = 'main.py plan'
+    _parser = None
+
+    @classmethod
+    def _add_arguments(cls, parser: ArgumentParser) -> None:
+        from planner import SeasonPlanner
+        parser.add_argument(
+            '--season', '-s', choices=RecommendationGenerator.SEASONS, required=True,
+            help='Season',
+        )
+        parser.add_argument(
+            '--forecast', required=True,
+            help=f'Comma-separated weather of consecutive days, '
+                 f'e.g. sunny,sunny,rainy. At most {SeasonPlanner.MAX_DAYS} days.',
+        )
+        parser.add_argument(
+            '--catch', type=int, default=1,
+            help='Number of top recommended fish assumed to be caught every day. '
+                 'Caught fish are no longer recommended for bundles or gifts on later days. '
+                 'Default: 1.',
+        )
+
+    forecast: str
+    catch: int
+    # plans always use --config-file
+    config_dir = None
+
+    def _validate(self, parser: ArgumentParser) -> None:
+        from planner import SeasonPlanner
+        forecast = self._forecast
+        if '' in forecast:
+            parser.error('--forecast cannot have empty days')
+        if not forecast or len(forecast) > SeasonPlanner.MAX_DAYS:
+            parser.error(f'--forecast must have 1 to {SeasonPlanner.MAX_DAYS} days')
+        for weather in forecast:
+            if weather not in RecommendationGenerator.WEATHERS:
+                parser.error(f'invalid weather in --forecast: {weather!r} '
+                             f'(choose from {", ".join(RecommendationGenerator.WEATHERS)})')
+        if self.catch < 0:
+            parser.error('--catch cannot be negative')
+
+    @cached_property
+    def _forecast(self) -> list[str]:
+        return [weather.strip() for weather in self.forecast.split(',')]
+
+    @cached_property
+    def _plan(self) -> list['PlanDay']:
+        from planner import SeasonPlanner
+        planner = SeasonPlanner(
+            RecommendationGenerator(self._config, game_data=self._game_data),
+            self.season,
+            self._forecast,
+            catch=self.catch,
+        )
+        return list(planner.plan(top=self.top, min_score=self.min_score))
+
+    @property
+    def _fish_rows(self) -> typing.Iterator[tuple[dict, FishRecommendationScoreCalculator]]:
+        for day in self._plan:
+            for fish in day.recommendations:
+                yield {
+                    'Day': day.day,
+                    'Weather': day.weather,
+                    'Caught': '*' if fish in day.caught else '',
+                }, fish
+
+    @property
+    @returns(list)
+    def _document(self) -> list[dict]:
+        for day in self._plan:
+            yield {
+                'Day': day.day,
+                'Weather': day.weather,
+                'Recommendations': [self._output_fish(fish) for fish in day.recommendations],
+                'Caught': [fish.fish['id'] for fish in day.caught],
+            }
+
+
+class StartupMain(Main):
+    """Reports where the time of a run with the same arguments goes, against startup.BUDGET_MS."""
+
+    PROG = 'main.py startup'
+    _parser = None
+
+    @classmethod
+    def _add_arguments(cls, parser: ArgumentParser) -> None:
+        super()._add_arguments(parser)
+        parser.add_argument(
+            '--repeat', '-r', type=int, default=5,
+            help='Runs of every measurement; the best one is reported. Default: 5',
+        )
+        parser.add_argument(
+            '--imports', type=int, default=10,
+            help='Number of the slowest imports to list. Default: 10',
+        )
+
+    repeat: int
+    imports: int
+
+    def __init__(self, args=None):
+        if args is None:
+            args = sys.argv[1:]
+        super().__init__(args)
+        # the same run without the arguments of this command
+        self._run_args = [os.path.abspath(__file__), *self._strip_args(args)]
+
+    def _validate(self, parser: ArgumentParser) -> None:
+        super()._validate(parser)
+        if self.config_dir is not None:
+            parser.error('--config-dir cannot be used with startup')
+
+    @staticmethod
+    @returns(list)
+    def _strip_args(args: list[str]) -> list[str]:
+        skip = False
+        for arg in args:
+            if skip:
+                skip = False
+                continue
+            if arg in ('--repeat', '-r', '--imports'):
+                skip = True
+                continue
+            if arg.startswith(('--repeat=', '--imports=')):
+                continue
+            yield arg
+
+    def _best_ms(self, func: typing.Callable[[], typing.Any]) -> float:
+        best = float('inf')
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    @staticmethod
+    def _parse_config(main: Main) -> None:
+        if isinstance(main._config, Config):
+            _ = main._config.snapshot
+
+    @staticmethod
+    def _load_data(main: Main) -> None:
+        _ = main._recommend_gen._fish
+
+    @staticmethod
+    def _recommend(main: Main) -> None:
+        for _ in main._fish_rows:
+            pass
+
+    @staticmethod
+    def _output(main: Main) -> None:
+        with redirect_stdout(io.StringIO()):
+            main()
+
+    @returns(dict)
+    def _stage_ms(self) -> dict[str, float]:
+        """Every stage after the imports, in this process, from scratch every time."""
+        def parser():
+            Main._parser = None
+            Main.parser()
+
+        yield 'parser', self._best_ms(parser)
+
+        # every stage is timed as a run up to the stage, minus the run up to the previous stage
+        stages = (
+            ('config', self._parse_config),
+            ('data', self._load_data),
+            ('recommend', self._recommend),
+        )
+        def run_until(i: int) -> None:
+            main = Main(self._run_args[1:])
+            for _, step in stages[:i + 1]:
+                step(main)
+
+        previous = 0.0
+        for i, (stage, _) in enumerate(stages):
+            ms = self._best_ms(lambda: run_until(i))
+            yield stage, ms - previous
+            previous = ms
+        yield 'output', self._best_ms(lambda: self._output(Main(self._run_args[1:]))) - previous
+
+    def __call__(self):
+        from startup import BUDGET_MS, import_times, wall_times
+        slowest = sorted(import_times(self._run_args), key=lambda item: item.cumulative_us, reverse=True)
+        print(f'Slowest imports of {" ".join(self._run_args[1:]) or "a run"}, ms:')
+        print(RenderTable([
+            {'Module': item.module, 'Self': item.self_us / 1000, 'Cumulative': item.cumulative_us / 1000}
+            for item in slowest[:self.imports]
+        ]))
+        print()
+
+        interpreter = min(wall_times(['-c', 'pass'], self.repeat)) * 1000
+        imports = min(wall_times(['-c', f'import sys; sys.argv = {self._run_args!r}; import main'], self.repeat))
+        total = min(wall_times(self._run_args, self.repeat)) * 1000
+        stages = {
+            'interpreter': interpreter,
+            'imports': imports * 1000 - interpreter,
+            **self._stage_ms(),
+            'total': total,
+        }
+        print(f'Stages, best of {self.repeat}, ms:')
+        print(RenderTable([
+            {
+                'Stage': stage,
+                'Time': round(ms, 1),
+                'Budget': BUDGET_MS[stage],
+                'Over': '!' if ms > BUDGET_MS[stage] else '',
+            }
+            for stage, ms in stages.items()
+        ]))
+
+
+COMMANDS: dict[str, typing.Type[Main]] = {
+    'plan': PlanMain,
+    'startup': StartupMain,
+}
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if args and args[0] in COMMANDS:
+        COMMANDS[args[0]](args[1:])()
+    else:
+        Main(args)()
 
 
 if __name__ == '__main__':
-    Main()()
+    main()
@@ -0,0 +1,109 @@
+import bisect
+import typing
+from functools import cached_property
+
+from returns import returns
+
+from recommend import RecommendationGenerator, FishFactors, FishRecommendationScoreCalculator
+
+
+class PlanDay(typing.NamedTuple):
+    day: int
+    weather: str
+    recommendations: list[FishRecommendationScoreCalculator]
+    caught: list[FishRecommendationScoreCalculator]
+
+
+class SeasonPlanner:
+    """
+    Recommends for consecutive days of a season, assuming that the top fish of every day get caught.
+
+    A caught fish is no longer needed for bundles or gifts,
+    so a catch only changes the factors and the rank of that fish.
+    Everything else is computed once for the whole season.
+    """
+
+    MAX_DAYS = 28
+
+    # factors that no longer apply once the fish has been caught
+    RETIRED_FACTORS = (
+        FishFactors.BUNDLE,
+        FishFactors.GIFT,
+    )
+
+    def __init__(
+            self,
+            generator: RecommendationGenerator,
+            season: str,
+            forecast: typing.Sequence[str],
+            *,
+            catch: int = 1,
+    ):
+        self.generator = generator
+        self.season = season
+        self.forecast = forecast
+        self.catch = catch
+        self._caught_ids: set[str] = set()
+
+    @cached_property
+    @returns(dict)
+    def _factors(self) -> dict[str, dict[str, float]]:
+        for fish_id, fish_factors in self.generator._fish_factors.items():
+            yield fish_id, fish_factors.factors
+
+    @cached_property
+    @returns(dict)
+    def _entries(self) -> dict[str, tuple]:
+        # same order as RecommendationGenerator
+        for i, fish_factors in enumerate(self.generator._fish_factors.values()):
+            yield fish_factors.fish['id'], (-fish_factors.score, fish_factors.fish['en_name'], i, fish_factors.fish)
+
+    @cached_property
+    def _ranking(self) -> list[tuple]:
+        return sorted(self._entries.values())
+
+    def _caught(self, fish_id: str) -> None:
+        self._caught_ids.add(fish_id)
+        factors = self._factors[fish_id]
+        if not any(factor_name in factors for factor_name in self.RETIRED_FACTORS):
+            return
+
+        factors = {
+            factor_name: factor_score
+            for factor_name, factor_score in factors.items()
+            if factor_name not in self.RETIRED_FACTORS
+        }
+        self._factors[fish_id] = factors
+
+        entry = self._entries[fish_id]
+        del self._ranking[bisect.bisect_left(self._ranking, entry)]
+        entry = (-sum(factors.values()), *entry[1:])
+        bisect.insort(self._ranking, entry)
+        self._entries[fish_id] = entry
+
+    def _candidates(
+            self,
+            generator: RecommendationGenerator,
+    ) -> typing.Iterator[tuple[float, FishRecommendationScoreCalculator]]:
+        for neg_score, _, _, fish in self._ranking:
+            score = FishRecommendationScoreCalculator(generator, fish)
+            if score:
+                score.factors = self._factors[fish['id']]
+                score.score = -neg_score
+                if fish['id'] in self._caught_ids:
+                    score.retired_factors = self.RETIRED_FACTORS
+            yield -neg_score, score
+
+    def plan(self, *, top: int = None, min_score: float = None) -> typing.Iterator[PlanDay]:
+        for day, weather in enumerate(self.forecast, 1):
+            generator = self.generator.for_day(self.season, weather)
+            # the ranking changes with every catch
+            recommendations = list(generator.limit(self._candidates(generator), top=top, min_score=min_score))
+            # fish caught on an earlier day are not caught again
+            caught = [
+                fish for fish in recommendations
+                if fish.fish['id'] not in self._caught_ids
+            ][:self.catch]
+            for fish in caught:
+                self._caught(fish.fish['id'])
+            yield PlanDay(day, weather, recommendations, caught)
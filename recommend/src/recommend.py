@@ -1,28 +1,164 @@
 import json
+import os
 import typing
 from functools import cached_property
 
 from returns import returns
 
-from config import Config
+from availability import AvailabilityIndex, FishAvailability
+from config import Config, ConfigSnapshot
 from utils import merge
 
+if typing.TYPE_CHECKING:
+    import multilang
+    from cache import CacheKey, ResultCache
+    from startup import StartupCache
+
+
+def load_game_data(data_file: str, language: str = None, *, startup_cache: 'StartupCache' = None) -> typing.Mapping:
+    """
+    Loads a JSON data file, or memory-maps a snapshot written by prepare-data.
+    For a file of all languages or a delta, `language` selects the names.
+    With `startup_cache`, a JSON file is only decoded again when it changes.
+    """
+    # snapshot is only imported for files that are not JSON
+    if not data_file.endswith('.json'):
+        import snapshot
+        if data_file.endswith(f'.{snapshot.EXT}'):
+            return snapshot.load(data_file)
+
+    if startup_cache is not None:
+        game_data = startup_cache.json(data_file)
+    else:
+        with open(data_file) as f:
+            game_data = json.load(f)
+    # a data file of one language; only files of all languages (or deltas of them) have "languages" instead
+    if 'language' in game_data:
+        return game_data
+
+    import delta
+    import multilang
+
+    if delta.is_delta(game_data):
+        game_data = delta.load(data_file, game_data)
+    if multilang.is_multi_language(game_data):
+        return multilang.MultiLanguageData(game_data)[language]
+    return game_data
+
+
+@returns(list)
+def load_all_languages(data_dir: str, index: typing.Mapping, version: str) -> list[typing.Mapping]:
+    """
+    Every language of a version, sharing one data file if prepare-data wrote it.
+    Versions stored as a delta are materialized from their base, and cached.
+    """
+    all_languages = index.get('deltas', {}).get(version) or index.get('all_languages', {}).get(version)
+    if all_languages is not None:
+        import delta
+        import multilang
+        data = multilang.MultiLanguageData(delta.load(os.path.join(data_dir, all_languages)))
+        for language in data.languages:
+            yield data[language['language']]
+        return
+
+    for data_file_name in index[version]:
+        yield load_game_data(os.path.join(data_dir, data_file_name))
+
+
+class Names:
+    """
+    Resolves names from the data file of a single language.
+    See multilang.StringTable for the data file of all languages.
+    """
+
+    @staticmethod
+    def of(game_data: typing.Mapping) -> typing.Union['Names', 'multilang.StringTable']:
+        strings = game_data.get('strings')
+        if strings is None:
+            return Names()
+        import multilang
+        return multilang.StringTable(strings)
+
+    @staticmethod
+    def fish(fish: dict) -> str:
+        return fish['name']
+
+    @staticmethod
+    def location(location: dict) -> str:
+        return location['name']
+
+    @staticmethod
+    def bundle(bundle: dict) -> str:
+        return bundle['name']
+
+    @staticmethod
+    def character(character: dict) -> str:
+        return character['name']
+
 
 class RecommendationGenerator:
-    def __init__(self, config: Config, season: str, weather: str):
+    SEASONS = AvailabilityIndex.SEASONS
+    WEATHERS = AvailabilityIndex.WEATHERS
+
+    # state that only depends on the data file, handed over by for_day() and for_config()
+    _DATA_SHARED = (
+        '_game_data',
+        'names',
+        '_fish',
+        '_index',
+    )
+    # day-independent state handed over by for_day()
+    _SHARED = _DATA_SHARED + (
+        '_config_mask',
+        '_fish_factors',
+        '_ranked',
+        'cache',
+    )
+    # config-independent state of the day, also handed over by for_config()
+    _DAY_SHARED = (
+        '_day_fish',
+    )
+
+    # whether get() can walk fish in order of their score bounds instead of scoring every fish, with `prune`
+    _PRUNE = True
+
+    def __init__(
+            self,
+            config: Config | ConfigSnapshot,
+            season: str = None,
+            weather: str = None,
+            *,
+            game_data: typing.Mapping = None,
+            cache: 'ResultCache' = None,
+            prune: bool = False,
+    ):
+        """
+        With `prune`, limited queries walk the fish in order of their day-independent score.
+        Ranking every fish costs more than scoring the fish of one day,
+        so it only pays off for generators whose ranking is shared by many days (see for_day).
+        """
+        if isinstance(config, Config):
+            config = config.snapshot
         self.config = config
         self.season = season
         self.weather = weather
+        self.cache = cache
+        self.prune = prune
+        if game_data is not None:
+            self._game_data = game_data
 
     @cached_property
-    def _game_data(self) -> dict:
-        with open(self.config.data_file) as f:
-            return json.load(f)
+    def _game_data(self) -> typing.Mapping:
+        return load_game_data(self.config.data_file, self.config.language)
 
     @cached_property
     def is_english(self) -> bool:
         return self._game_data['lang_code'] is None
 
+    @cached_property
+    def names(self) -> 'Names | multilang.StringTable':
+        return Names.of(self._game_data)
+
     @cached_property
     @returns(dict)
     def _fish(self) -> dict[str, dict]:
@@ -30,36 +166,166 @@ class RecommendationGenerator:
             yield fish_id, fish
 
     @cached_property
-    @returns(lambda iterable: sorted(iterable, key=FishRecommendationScoreCalculator.sort_key))
-    def _scores(self) -> list['FishRecommendationScoreCalculator']:
+    def _index(self) -> AvailabilityIndex:
+        return AvailabilityIndex(self._fish)
+
+    @cached_property
+    def _config_mask(self) -> int:
+        return self._index.config_mask(self.config)
+
+    @cached_property
+    @returns(dict)
+    def _fish_factors(self) -> dict[str, 'FishFactors']:
+        for fish_id, fish in self._fish.items():
+            yield fish_id, FishFactors(self, fish)
+
+    def for_day(self, season: str, weather: str) -> typing.Self:
+        """
+        Returns a generator for another day with the same config.
+        Loaded data and day-independent factors are shared instead of being recomputed.
+        """
+        generator = self.__class__(self.config, season, weather, prune=self.prune)
+        for attr in self._SHARED:
+            setattr(generator, attr, getattr(self, attr))
+        return generator
+
+    def for_config(self, config: Config | ConfigSnapshot) -> typing.Self:
+        """
+        Returns a generator for the same day with another config of the same data file.
+        Loaded data, the availability index and the fish that can appear on the day are shared.
+        """
+        generator = self.__class__(config, self.season, self.weather, cache=self.cache, prune=self.prune)
+        for attr in self._DATA_SHARED + self._DAY_SHARED:
+            setattr(generator, attr, getattr(self, attr))
+        return generator
+
+    @cached_property
+    @returns(list)
+    def _day_fish(self) -> list[dict]:
+        """Fish that appear on the day with some config: in the weather, and somewhere in the season."""
+        season_mask = self._index.season_mask(self.season)
         for fish_id, fish in self._fish.items():
+            if self.weather not in fish['weather']:
+                continue
+            if not self._index[fish_id].mask & season_mask:
+                continue
+            yield fish
+
+    @returns(lambda iterable: sorted(iterable, key=FishRecommendationScoreCalculator.sort_key))
+    def _compute_scores(self) -> list['FishRecommendationScoreCalculator']:
+        for fish in self._day_fish:
             score = FishRecommendationScoreCalculator(self, fish)
             if not score:
                 continue
             yield score
 
+    @property
+    def _cache_key(self) -> 'CacheKey':
+        from cache import CacheKey
+        return CacheKey(
+            version=self._game_data['version'],
+            language=self._game_data['language'],
+            config_hash=self.config.content_hash,
+            season=self.season,
+            weather=self.weather,
+        )
+
+    @cached_property
+    def _scores(self) -> list['FishRecommendationScoreCalculator']:
+        if self.cache is None:
+            return self._compute_scores()
+
+        key = self._cache_key
+        cached = self.cache.get(key)
+        if cached is not None:
+            return [
+                FishRecommendationScoreCalculator.from_factors(self, self._fish[fish_id], factors)
+                for fish_id, factors in cached
+            ]
+
+        scores = self._compute_scores()
+        self.cache.put(key, [(score.fish['id'], score.factors) for score in scores])
+        return scores
+
+    @cached_property
+    def _ranked(self) -> 'RankedFish':
+        return RankedFish(self._fish_factors.values())
+
+    @property
+    def _bounded_scores(self) -> typing.Iterator[tuple[float, 'FishRecommendationScoreCalculator']]:
+        """(upper bound of the score, fish), in ranked order; the fish may not be appearing."""
+        for fish_factors in self._ranked:
+            yield fish_factors.score, FishRecommendationScoreCalculator(self, fish_factors.fish)
+
+    def _candidates(
+            self,
+            top: int | None,
+            min_score: float | None,
+    ) -> typing.Iterable[tuple[float, 'FishRecommendationScoreCalculator']]:
+        if (
+                not (self.prune and self._PRUNE)
+                or self.cache is not None
+                or '_scores' in self.__dict__
+                or (top is None and min_score is None)
+        ):
+            return ((score.score, score) for score in self._scores)
+        return self._bounded_scores
+
     def get(self, *, top: int = None, min_score: float = None) -> typing.Iterator['FishRecommendationScoreCalculator']:
+        return self.limit(self._candidates(top, min_score), top=top, min_score=min_score)
+
+    @staticmethod
+    def limit(
+            candidates: typing.Iterable[tuple[float, 'FishRecommendationScoreCalculator']],
+            *,
+            top: int = None,
+            min_score: float = None,
+    ) -> typing.Iterator['FishRecommendationScoreCalculator']:
+        """
+        Applies `top` and `min_score` to (upper bound of the score, fish) in ranked order.
+        Fish that are not appearing are skipped.
+        """
         if top is not None and top <= 0:
             return
 
         count = 0
         last_score = None
 
-        for score in self._scores:
-            if min_score is not None and score.score < min_score:
+        for bound, score in candidates:
+            # no fish after this one can score higher than its bound
+            if min_score is not None and bound < min_score:
                 return
 
             if top is not None:
                 if count >= top:
-                    if score.score < last_score:
+                    if bound < last_score:
                         return
 
+            if not score:
+                continue
+
             yield score
             count += 1
             last_score = score.score
 
+    @returns(dict)
+    def matrix(
+            self,
+            *,
+            top: int = None,
+            min_score: float = None,
+    ) -> dict[tuple[str, str], list['FishRecommendationScoreCalculator']]:
+        for season in self.SEASONS:
+            for weather in self.WEATHERS:
+                generator = self.for_day(season, weather)
+                yield (season, weather), list(generator.get(top=top, min_score=min_score))
+
+
+class FishFactors:
+    """
+    The parts of a fish's recommendation that do not depend on the day.
+    """
 
-class FishRecommendationScoreCalculator:
     SEASON = 'season'
     WEATHER = 'weather'
     BUNDLE = 'bundle'
@@ -81,69 +347,29 @@ class FishRecommendationScoreCalculator:
         self.fish = fish
 
     @property
-    def _config(self) -> Config:
+    def _config(self) -> ConfigSnapshot:
         return self.parent.config
 
     @property
     def _fish_id(self) -> str:
         return self.fish['id']
 
-    def _skip_rainy_winter(self, location: dict) -> bool:
-        if self._config.winter_rain_totem:
-            return False
-        if location['key'].startswith('Island'):
-            return False
-        if location['season'] != 'winter':
-            return False
-        if 'sunny' in self.fish['weather']:
-            return False
-        return True
-
-    @cached_property
-    @returns(list)
-    def _unlocked_locations(self) -> list[dict]:
-        if not self.fish['locations']:
-            return
-
-        for location in self.fish['locations']:
-            if location['key'] not in self._config.unlocked_areas:
-                continue
-            if self._skip_rainy_winter(location):
-                continue
-            yield location
-
     @cached_property
-    @returns(list)
-    def _appearing_locations(self) -> list[dict]:
-        for location in self._unlocked_locations:
-            if location['season'] != self.parent.season:
-                continue
-            yield location
+    def availability(self) -> FishAvailability:
+        return self.parent._index[self._fish_id]
 
     @cached_property
-    def _appearing(self) -> bool:
-        if self._config.fishing_level < self.fish['min_level']:
-            return False
-        if self.parent.weather not in self.fish['weather']:
-            return False
-        if not self._appearing_locations:
-            return False
-        return True
-
-    def __bool__(self) -> bool:
-        return self._appearing
+    def unlocked_mask(self) -> int:
+        return self.availability.mask & self.parent._config_mask
 
     @cached_property
-    @returns(lambda items: sorted(items, key=('spring', 'summer', 'fall', 'winter').index))
-    @returns(set)
-    def _available_seasons(self) -> set[str]:
+    def available_seasons(self) -> list[str]:
         # use unlocked locations instead of all locations
-        for location in self._unlocked_locations:
-            yield location['season']
+        return self.parent._index.seasons(self.unlocked_mask)
 
     @cached_property
     def _season_factor(self) -> float:
-        return self._config.rec_season_factor * (4 - len(self._available_seasons))
+        return self._config.rec_season_factor * (4 - len(self.available_seasons))
 
     @cached_property
     def _weather_factor(self) -> float:
@@ -156,7 +382,7 @@ class FishRecommendationScoreCalculator:
 
     @cached_property
     @returns(list)
-    def _bundles(self) -> list[dict]:
+    def bundles(self) -> list[dict]:
         if not self.fish['bundles']:
             return
 
@@ -170,14 +396,14 @@ class FishRecommendationScoreCalculator:
 
     @cached_property
     def _bundle_factor(self) -> float:
-        if self._bundles:
+        if self.bundles:
             return self._config.rec_bundle_factor
         else:
             return 0.0
 
     @cached_property
     @returns(merge)
-    def _gifts(self) -> dict[str, list[dict]]:
+    def gifts(self) -> dict[str, list[dict]]:
         if not self.fish['gifts']:
             return
 
@@ -189,19 +415,19 @@ class FishRecommendationScoreCalculator:
 
     @cached_property
     def _gift_factor(self) -> float:
-        if self._gifts:
+        if self.gifts:
             return self._config.rec_gift_factor
         else:
             return 0.0
 
     @property
-    def _difficulty(self) -> int:
+    def difficulty(self) -> int:
         return self.fish['difficulty']
 
     @cached_property
     @returns(lambda x: round(x, 6))  # this is to stop float point precision problems causing x.00000000000001
     def _difficulty_factor(self) -> float:
-        return self._difficulty * self._config.rec_difficulty_factor
+        return self.difficulty * self._config.rec_difficulty_factor
 
     @cached_property
     def _favorite_factor(self) -> float:
@@ -210,9 +436,6 @@ class FishRecommendationScoreCalculator:
     @cached_property
     @returns(dict)
     def factors(self) -> dict[str, float]:
-        if not self._appearing:
-            return
-
         for factor_name in self.FACTORS:
             factor_attr = f'_{factor_name}_factor'
             factor_score = getattr(self, factor_attr)
@@ -223,43 +446,29 @@ class FishRecommendationScoreCalculator:
     @cached_property
     @returns(sum)
     def score(self) -> float:
-        if not self._appearing:
-            return
-
         yield from self.factors.values()
 
-    @staticmethod
-    def sort_key(item: 'FishRecommendationScoreCalculator'):
-        return -item.score, item.fish['en_name']
-
     @returns(dict)
-    def _get_name_verbose(self, name: str, en_name: str) -> dict[str, str]:
+    def get_name_verbose(self, name: str, en_name: str) -> dict[str, str]:
         yield 'Name', name
         if not self.parent.is_english:
             yield 'English name', en_name
 
-    @cached_property
-    def _output_name_verbose(self) -> dict[str, str]:
-        return self._get_name_verbose(self.fish['name'], self.fish['en_name'])
+    @property
+    def _names(self) -> 'Names | multilang.StringTable':
+        return self.parent.names
 
     @cached_property
-    def _output_difficulty(self) -> tuple[int, str]:
-        return self._difficulty, self.fish['behavior']
+    def output_name(self) -> str:
+        return self._names.fish(self.fish)
 
     @cached_property
-    @returns(list)
-    def _output_locations(self) -> list[str]:
-        for location in self._appearing_locations:
-            yield location['name']
+    def output_name_verbose(self) -> dict[str, str]:
+        return self.get_name_verbose(self.output_name, self.fish['en_name'])
 
     @cached_property
-    @returns(list)
-    def _output_locations_verbose(self) -> list[dict]:
-        for location in self._appearing_locations:
-            yield {
-                'Name': location['name'],
-                'Key': location['key'],
-            }
+    def output_difficulty(self) -> tuple[int, str]:
+        return self.difficulty, self.fish['behavior']
 
     @staticmethod
     def _output_preference_type(preference_type: str) -> str:
@@ -267,37 +476,205 @@ class FishRecommendationScoreCalculator:
 
     @cached_property
     @returns(merge)
-    def _output_gifts(self) -> dict[str, list[str]]:
-        for preference_type, characters in self._gifts.items():
+    def output_gifts(self) -> dict[str, list[str]]:
+        for preference_type, characters in self.gifts.items():
             preference_type = self._output_preference_type(preference_type)
             for character in characters:
-                yield preference_type, character['name']
+                yield preference_type, self._names.character(character)
 
     @cached_property
     @returns(merge)
-    def _output_gifts_verbose(self) -> dict[str, list[str]]:
-        for preference_type, characters in self._gifts.items():
+    def output_gifts_verbose(self) -> dict[str, list[str]]:
+        for preference_type, characters in self.gifts.items():
             preference_type = self._output_preference_type(preference_type)
             for character in characters:
                 yield (
                     preference_type,
-                    self._get_name_verbose(character['name'], character['key']),
+                    self.get_name_verbose(self._names.character(character), character['key']),
                 )
 
     @cached_property
     @returns(list)
-    def _output_bundles(self) -> list[str]:
-        for bundle in self._bundles:
-            yield bundle['name']
+    def output_bundles(self) -> list[str]:
+        for bundle in self.bundles:
+            yield self._names.bundle(bundle)
+
+    @cached_property
+    @returns(list)
+    def output_bundles_verbose(self) -> list[str]:
+        for bundle in self.bundles:
+            yield self.get_name_verbose(self._names.bundle(bundle), bundle['en_name'])
+
+
+class RankedFish:
+    """
+    Fish in descending order of their day-independent score,
+    which is the score of any day the fish is appearing, and 0 otherwise.
+
+    Ordered lazily with a heap, so that a query for the top few fish does not sort every fish,
+    and shared between days.
+    """
+
+    def __init__(self, fish_factors: typing.Iterable[FishFactors]):
+        # same order as sorting by FishRecommendationScoreCalculator.sort_key, which is stable
+        self._heap = [
+            (-item.score, item.fish['en_name'], i, item)
+            for i, item in enumerate(fish_factors)
+        ]
+        import heapq
+        import threading
+        heapq.heapify(self._heap)
+        self._sorted: list[FishFactors] = []
+        self._lock = threading.Lock()
+
+    def _pop(self, i: int) -> FishFactors | None:
+        import heapq
+        with self._lock:
+            while len(self._sorted) <= i:
+                if not self._heap:
+                    return None
+                self._sorted.append(heapq.heappop(self._heap)[-1])
+            return self._sorted[i]
+
+    def __iter__(self) -> typing.Iterator[FishFactors]:
+        i = 0
+        while True:
+            if i < len(self._sorted):
+                item = self._sorted[i]
+            else:
+                item = self._pop(i)
+                if item is None:
+                    return
+            yield item
+            i += 1
+
+
+class FishRecommendationScoreCalculator:
+    GIFT_FIELDS = (
+        'Loved by',
+        'Liked by',
+    )
+
+    # columns of output()
+    FIELDS = (
+        'ID',
+        'Name',
+        'Difficulty',
+        'Score',
+        'Factors',
+        'Locations',
+        'Available seasons',
+        'Available weathers',
+        'Hours',
+        *GIFT_FIELDS,
+        'Bundles',
+    )
+    SHORT_FIELDS = (
+        'Name',
+        'Score',
+        'Locations',
+        'Hours',
+        *GIFT_FIELDS,
+        'Bundles',
+    )
+
+    # factors whose columns are left out of output(), e.g. of fish already caught in a plan
+    retired_factors: tuple[str, ...] = ()
+
+    def __init__(self, parent: RecommendationGenerator, fish: dict):
+        self.parent = parent
+        self.fish = fish
+
+    @property
+    def _config(self) -> ConfigSnapshot:
+        return self.parent.config
+
+    @property
+    def _fish_id(self) -> str:
+        return self.fish['id']
+
+    @cached_property
+    def _static(self) -> FishFactors:
+        return self.parent._fish_factors[self._fish_id]
+
+    @cached_property
+    def _appearing_mask(self) -> int:
+        return self._static.unlocked_mask & self.parent._index.season_mask(self.parent.season)
+
+    @cached_property
+    def _appearing_locations(self) -> list[dict]:
+        return self._static.availability.locations(self._appearing_mask)
+
+    @cached_property
+    def _appearing(self) -> bool:
+        if self._config.fishing_level < self.fish['min_level']:
+            return False
+        if self.parent.weather not in self.fish['weather']:
+            return False
+        if not self._appearing_mask:
+            return False
+        return True
+
+    def __bool__(self) -> bool:
+        return self._appearing
+
+    @classmethod
+    def from_factors(
+            cls,
+            parent: RecommendationGenerator,
+            fish: dict,
+            factors: dict[str, float],
+    ) -> 'FishRecommendationScoreCalculator':
+        """An appearing fish whose factors are already known."""
+        score = cls(parent, fish)
+        score._appearing = True
+        score.factors = factors
+        score.score = sum(factors.values())
+        return score
+
+    @cached_property
+    def factors(self) -> dict[str, float]:
+        if not self._appearing:
+            return {}
+        return self._static.factors
+
+    @cached_property
+    def score(self) -> float:
+        if not self._appearing:
+            return 0
+        return self._static.score
+
+    @staticmethod
+    def sort_key(item: 'FishRecommendationScoreCalculator'):
+        return -item.score, item.fish['en_name']
+
+    @cached_property
+    @returns(list)
+    def _output_locations(self) -> list[str]:
+        for location in self._appearing_locations:
+            yield self.parent.names.location(location)
 
     @cached_property
     @returns(list)
-    def _output_bundles_verbose(self) -> list[str]:
-        for bundle in self._bundles:
-            yield self._get_name_verbose(bundle['name'], bundle['en_name'])
+    def _output_locations_verbose(self) -> list[dict]:
+        for location in self._appearing_locations:
+            yield {
+                'Name': self.parent.names.location(location),
+                'Key': location['key'],
+            }
 
     @returns(dict)
-    def output(self, *, verbose: bool = False, table: bool = False) -> dict:
+    def output(
+            self,
+            *,
+            verbose: bool = False,
+            table: bool = False,
+            fields: typing.Collection[str] = None,
+    ) -> dict:
+        """
+        `fields` selects columns from FIELDS, which are then the only ones computed.
+        Default: the columns of the verbose or the short output.
+        """
         if table:
             def table_col_split(col_name: str):
                 return tuple(col_name.split())
@@ -305,35 +682,47 @@ class FishRecommendationScoreCalculator:
             def table_col_split(col_name: str):
                 return col_name
 
-        if verbose:
-            yield 'ID', self._fish_id
-            yield 'Name', self._output_name_verbose
-            yield 'Difficulty', self._output_difficulty
-        else:
-            yield 'Name', self.fish['name']
+        if fields is None:
+            fields = self.FIELDS if verbose else self.SHORT_FIELDS
 
-        yield 'Score', self.score
-        if verbose:
+        if 'ID' in fields:
+            yield 'ID', self._fish_id
+        if 'Name' in fields:
+            yield 'Name', self._static.output_name_verbose if verbose else self._static.output_name
+        if 'Difficulty' in fields:
+            yield 'Difficulty', self._static.output_difficulty
+
+        if 'Score' in fields:
+            yield 'Score', self.score
+        if 'Factors' in fields:
             yield 'Factors', self.factors
 
-        if verbose:
-            yield 'Locations', self._output_locations_verbose
-            yield table_col_split('Available seasons'), self._available_seasons
+        if 'Locations' in fields:
+            yield 'Locations', self._output_locations_verbose if verbose else self._output_locations
+        if 'Available seasons' in fields:
+            yield table_col_split('Available seasons'), self._static.available_seasons
+        if 'Available weathers' in fields:
             yield table_col_split('Available weathers'), self.fish['weather']
-        else:
-            yield 'Locations', self._output_locations
-
-        yield 'Hours', self.fish['time_ranges']
-
-        output_gifts = self._output_gifts_verbose if verbose else self._output_gifts
-        if table:
-            output_gifts = {
-                'Loved by': output_gifts.get('Loved by'),
-                'Liked by': output_gifts.get('Liked by'),
-            }
-        yield from output_gifts.items()
 
-        if self._bundles:
-            yield 'Bundles', self._output_bundles_verbose if verbose else self._output_bundles
-        elif table:
-            yield 'Bundles', []
+        if 'Hours' in fields:
+            yield 'Hours', self.fish['time_ranges']
+
+        gift_fields = [field for field in self.GIFT_FIELDS if field in fields]
+        if gift_fields:
+            if FishFactors.GIFT in self.retired_factors:
+                output_gifts = {}
+            else:
+                output_gifts = self._static.output_gifts_verbose if verbose else self._static.output_gifts
+            if table:
+                for field in gift_fields:
+                    yield field, output_gifts.get(field)
+            else:
+                for field, characters in output_gifts.items():
+                    if field in fields:
+                        yield field, characters
+
+        if 'Bundles' in fields:
+            if self._static.bundles and FishFactors.BUNDLE not in self.retired_factors:
+                yield 'Bundles', self._static.output_bundles_verbose if verbose else self._static.output_bundles
+            elif table:
+                yield 'Bundles', []
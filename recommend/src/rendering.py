@@ -1,26 +1,44 @@
 import typing
-from functools import cached_property
+from functools import cached_property, lru_cache
 from itertools import zip_longest
 
 from returns import returns
-from unicodedata import east_asian_width
+from unicodedata import category, combining, east_asian_width
 
 
 class StringWidthCalculator:
     EAST_ASIAN_WIDTH = {
-        'Na': 1,
-        'W': 2,
+        'Na': 1,  # narrow
+        'H': 1,  # halfwidth
+        'N': 1,  # neutral
+        'A': 1,  # ambiguous, narrow outside of East Asian legacy encodings
+        'W': 2,  # wide
+        'F': 2,  # fullwidth
     }
 
+    # format characters such as zero width space or joiners
+    ZERO_WIDTH_CATEGORIES = {'Mn', 'Me', 'Cf'}
+
+    _char_widths: dict[str, int] = {}
+
     @classmethod
     def get_character_width(cls, char: str) -> int:
-        return cls.EAST_ASIAN_WIDTH[east_asian_width(char)]
+        width = cls._char_widths.get(char)
+        if width is None:
+            if combining(char) or category(char) in cls.ZERO_WIDTH_CATEGORIES:
+                width = 0
+            else:
+                width = cls.EAST_ASIAN_WIDTH[east_asian_width(char)]
+            cls._char_widths[char] = width
+        return width
 
     @classmethod
-    @returns(sum)
+    @lru_cache(maxsize=65536)
     def get(cls, s: str) -> int:
-        for char in s:
-            yield cls.get_character_width(char)
+        # cells are measured when rendered and again when padded
+        if s.isascii():
+            return len(s)
+        return sum(map(cls.get_character_width, s))
 
 
 string_width = StringWidthCalculator.get
@@ -43,15 +61,22 @@ class TableColumn:
             name: str | tuple[str],
             *,
             formatter: FORMATTER = None,
+            width: int = None,
     ):
+        """`width` fixes the width of the column, instead of growing it with every rendered value."""
         self.name = name
-        self._width = 0
+        self._width = width or 0
+        self._fixed = width is not None
         self._formatter = self.default_formatter
         self.print_name: list[str] = self.render(name)
 
         if formatter is not None:
             self._formatter = formatter
 
+    @property
+    def width(self) -> int:
+        return self._width
+
     def render(self, value) -> list[str]:
         if value is None:
             value_s = ''
@@ -61,8 +86,9 @@ class TableColumn:
         if isinstance(value_s, str):
             value_s = [value_s]
 
-        for value_s_row in value_s:
-            self._width = max(self._width, string_width(value_s_row))
+        if not self._fixed:
+            for value_s_row in value_s:
+                self._width = max(self._width, string_width(value_s_row))
         return value_s
 
     def format(self, s: str | None) -> str:
@@ -80,17 +106,34 @@ class TableColumns:
             self,
             *,
             formatters: dict[str, FORMATTER] = None,
+            widths: dict[str, int] = None,
     ):
+        """
+        With `widths`, the columns and their widths are fixed,
+        so that rows can be formatted as soon as they are rendered.
+        """
         self._columns: list[TableColumn] = []
+        self._columns_by_name: dict[str, TableColumn] = {}
         if formatters is None:
             formatters = {}
         self._formatters = formatters
+        self._fixed = widths is not None
+
+        if widths is not None:
+            for name, width in widths.items():
+                self._add(TableColumn(name, formatter=formatters.get(name), width=width))
+
+    def _add(self, col: TableColumn):
+        self._columns.append(col)
+        self._columns_by_name[col.name] = col
 
     def __contains__(self, name: str) -> bool:
+        return name in self._columns_by_name
+
+    @returns(dict)
+    def widths(self) -> dict[str, int]:
         for col in self._columns:
-            if col.name == name:
-                return True
-        return False
+            yield col.name, col.width
 
     @returns(list)
     @returns(lambda x: zip_longest(*x))
@@ -101,8 +144,10 @@ class TableColumns:
         for name, value in item.items():
             if name in self:
                 continue
+            if self._fixed:
+                raise ValueError(f'Column is not in the schema: {name!r}')
             col = TableColumn(name, formatter=self._formatters.get(name))
-            self._columns.append(col)
+            self._add(col)
             yield col.render(value)
 
     @returns(lambda s: s.strip())
@@ -158,3 +203,50 @@ class RenderTable:
 
     def __str__(self) -> str:
         return self._s
+
+
+def column_widths(
+        data: typing.Iterable[dict],
+        *,
+        formatters: dict[str, FORMATTER] = None,
+) -> dict[str, int]:
+    """
+    Renders every item once without keeping it,
+    and returns the schema of a StreamingRenderTable that fits all of them.
+    """
+    columns = TableColumns(formatters=formatters)
+    for item in data:
+        columns.render(item)
+    return columns.widths()
+
+
+class StreamingRenderTable:
+    """
+    Same output as RenderTable, but every row is emitted as soon as it is rendered,
+    because the column widths are given by a schema of {column name: width} (see `column_widths`).
+
+    Values wider than their column are not cut, and shift the rest of the line.
+    """
+
+    def __init__(
+            self,
+            data: typing.Iterable[dict],
+            *,
+            widths: dict[str, int],
+            formatters: dict[str, FORMATTER] = None,
+    ):
+        self._data = data
+        self._widths = widths
+        self._formatters = formatters
+
+    def __iter__(self) -> typing.Iterator[str]:
+        columns = TableColumns(formatters=self._formatters, widths=self._widths)
+        yield from columns.header
+        separator = columns.separator
+        for item in self._data:
+            yield separator
+            for row_row in columns.render(item):
+                yield columns.format(row_row)
+
+    def __str__(self) -> str:
+        return '\n'.join(self)
@@ -0,0 +1,272 @@
+"""
+Player progress read from a Stardew Valley save file, instead of the config file.
+
+Saves of late games are XML files of several MB, so they are streamed through a parser target
+that keeps only the few values that are needed and skips every other subtree, without creating elements.
+Progress is cached until the save file changes, in memory and optionally in a StartupCache.
+"""
+import os
+import typing
+from functools import lru_cache
+from types import MappingProxyType
+from xml.etree.ElementTree import XMLParser
+
+from config import Config, ConfigSnapshot
+from startup import StartupCache
+
+CACHE_SIZE = 8
+CHUNK_SIZE = 64 * 1024
+
+XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
+COMMUNITY_CENTER = 'CommunityCenter'
+# locations that have one name per level, e.g. UndergroundMine20
+LEVELED_LOCATIONS = ('UndergroundMine',)
+
+PLAYER = ('SaveGame', 'player')
+FISHING_LEVEL = (*PLAYER, 'fishingLevel')
+LOCATIONS_VISITED = (*PLAYER, 'locationsVisited')
+LOCATION_VISITED = (*LOCATIONS_VISITED, 'string')
+FISH_CAUGHT_KEY = (*PLAYER, 'fishCaught', 'item', 'key')
+# an int before 1.6, a string since
+FISH_CAUGHT_IDS = ((*FISH_CAUGHT_KEY, 'int'), (*FISH_CAUGHT_KEY, 'string'))
+BUNDLE_DATA_KEY = ('SaveGame', 'bundleData', 'item', 'key', 'string')
+BUNDLE_DATA_VALUE = ('SaveGame', 'bundleData', 'item', 'value', 'string')
+LOCATION = ('SaveGame', 'locations', 'GameLocation')
+COMMUNITY_CENTER_BUNDLES = (*LOCATION, 'bundles', 'item')
+BUNDLE_INDEX = (*COMMUNITY_CENTER_BUNDLES, 'key', 'int')
+BUNDLE_ITEM_DONATED = (*COMMUNITY_CENTER_BUNDLES, 'value', 'ArrayOfBoolean', 'boolean')
+
+# paths of the elements whose text is kept
+VALUES = frozenset((
+    FISHING_LEVEL,
+    LOCATION_VISITED,
+    *FISH_CAUGHT_IDS,
+    BUNDLE_DATA_KEY,
+    BUNDLE_DATA_VALUE,
+    BUNDLE_INDEX,
+    BUNDLE_ITEM_DONATED,
+))
+# paths that lead to them; everything else is skipped
+PREFIXES = frozenset(path[:i] for path in VALUES for i in range(1, len(path) + 1))
+
+
+class Bundle(typing.NamedTuple):
+    en_name: str
+    # item IDs, in the order of the donation state
+    items: tuple[str, ...]
+    required: int
+
+
+class SaveProgress(typing.NamedTuple):
+    fishing_level: int
+    # None for saves of game versions that do not record visited locations
+    locations_visited: frozenset[str] | None
+    fish_caught: frozenset[str]
+    # bundle index -> bundle, and whether every item has been donated
+    bundles: dict[int, Bundle]
+    donated: dict[int, tuple[bool, ...]]
+
+    def dump(self) -> tuple:
+        """Values that marshal can write."""
+        return (
+            self.fishing_level,
+            self.locations_visited,
+            self.fish_caught,
+            {index: tuple(bundle) for index, bundle in self.bundles.items()},
+            self.donated,
+        )
+
+    @classmethod
+    def from_dump(cls, values: tuple) -> 'SaveProgress':
+        fishing_level, locations_visited, fish_caught, bundles, donated = values
+        return cls(
+            fishing_level,
+            locations_visited,
+            fish_caught,
+            {index: Bundle(*bundle) for index, bundle in bundles.items()},
+            donated,
+        )
+
+
+def _item_id(s: str) -> str:
+    """Object IDs are numbers before 1.6, and qualified since, e.g. (O)128."""
+    s = s.strip()
+    if s.startswith('(O)'):
+        return s[len('(O)'):]
+    return s
+
+
+def _location(name: str) -> str:
+    for prefix in LEVELED_LOCATIONS:
+        if name.startswith(prefix):
+            return prefix
+    return name
+
+
+def _bundle(value: str) -> Bundle:
+    """name/reward/items/color/number of items required/..., where items are (ID, count, quality) triplets"""
+    fields = value.split('/')
+    items = fields[2].split()
+    item_ids = tuple(_item_id(item_id) for item_id in items[::3])
+    required = int(fields[4]) if len(fields) > 4 and fields[4].strip() else len(item_ids)
+    return Bundle(fields[0], item_ids, required)
+
+
+class _SaveTarget:
+    """XMLParser target that collects the text of VALUES into a SaveProgress."""
+
+    def __init__(self):
+        # tags of the open elements, as long as they are in PREFIXES
+        self._path = []
+        # number of open elements below the path, which are skipped
+        self._skipped = 0
+        self._text: list[str] | None = None
+        self._bundle_index = None
+
+        self.fishing_level = 0
+        self.locations_visited = None
+        self.fish_caught = set()
+        self.bundle_keys = []
+        self.bundle_values = []
+        self.donated = {}
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        if self._skipped:
+            self._skipped += 1
+            return
+
+        self._path.append(tag)
+        key = tuple(self._path)
+        if key not in PREFIXES or (key == LOCATION and attrib.get(XSI_TYPE) != COMMUNITY_CENTER):
+            self._path.pop()
+            self._skipped = 1
+            return
+
+        if key == LOCATIONS_VISITED:
+            self.locations_visited = set()
+        elif key in VALUES:
+            self._text = []
+
+    def data(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+
+    def end(self, tag: str) -> None:
+        if self._skipped:
+            self._skipped -= 1
+            return
+
+        key = tuple(self._path)
+        self._path.pop()
+        if self._text is None:
+            return
+        text = ''.join(self._text)
+        self._text = None
+
+        if key == FISHING_LEVEL:
+            self.fishing_level = int(text)
+        elif key == LOCATION_VISITED:
+            self.locations_visited.add(_location(text))
+        elif key in FISH_CAUGHT_IDS:
+            self.fish_caught.add(_item_id(text))
+        elif key == BUNDLE_DATA_KEY:
+            self.bundle_keys.append(text)
+        elif key == BUNDLE_DATA_VALUE:
+            self.bundle_values.append(text)
+        elif key == BUNDLE_INDEX:
+            self._bundle_index = int(text)
+            self.donated[self._bundle_index] = []
+        elif key == BUNDLE_ITEM_DONATED:
+            self.donated[self._bundle_index].append(text == 'true')
+
+    def close(self) -> SaveProgress:
+        bundles = {
+            # e.g. Pantry/0
+            int(key.rsplit('/', 1)[1]): _bundle(value)
+            for key, value in zip(self.bundle_keys, self.bundle_values)
+        }
+        return SaveProgress(
+            self.fishing_level,
+            None if self.locations_visited is None else frozenset(self.locations_visited),
+            frozenset(self.fish_caught),
+            bundles,
+            {index: tuple(items) for index, items in self.donated.items()},
+        )
+
+
+def parse(save_file: str) -> SaveProgress:
+    parser = XMLParser(target=_SaveTarget())
+    with open(save_file, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            parser.feed(chunk)
+    return parser.close()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _load(path: str, stamp: tuple[int, int]) -> SaveProgress:
+    return parse(path)
+
+
+def load(save_file: str, *, startup_cache: StartupCache = None) -> SaveProgress:
+    """Progress of a save file, parsed again only when the file changes."""
+    if startup_cache is not None:
+        return SaveProgress.from_dump(startup_cache.get('save', save_file, lambda: parse(save_file).dump()))
+    stat = os.stat(save_file)
+    return _load(os.path.abspath(save_file), (stat.st_mtime_ns, stat.st_size))
+
+
+class SaveGame:
+    """
+    A config with the progress of a save file:
+    fishing level, visited areas, fish of bundles that have not been donated,
+    and fish loved or liked by every character that have never been caught.
+
+    Data file, language, recommendation factors, favorites and the winter rain totem come from the config file,
+    and so do unlocked areas for saves that do not record visited locations.
+    """
+
+    def __init__(self, save_file: str, *, startup_cache: StartupCache = None):
+        self.save_file = save_file
+        self.progress = load(save_file, startup_cache=startup_cache)
+
+    def _needed_bundles(self, fish_ids: typing.Container[str]) -> typing.Iterator[tuple[str, frozenset[str]]]:
+        """(English name, fish still needed) of every bundle that is not complete"""
+        for index, bundle in self.progress.bundles.items():
+            donated = self.progress.donated.get(index, ())
+            if sum(donated) >= bundle.required:
+                continue
+            needed = frozenset(
+                item_id
+                for i, item_id in enumerate(bundle.items)
+                if item_id in fish_ids and not (i < len(donated) and donated[i])
+            )
+            if needed:
+                yield bundle.en_name, needed
+
+    def _gift_lists(self, game_data: typing.Mapping) -> dict[str, frozenset[str]]:
+        """Every character, even if every fish they love or like has been caught"""
+        gift_lists = {}
+        for fish_id, fish in game_data['fish'].items():
+            for characters in (fish['gifts'] or {}).values():
+                for character in characters:
+                    fish_ids = gift_lists.setdefault(Config._get_opt_name(character['key']), set())
+                    if fish_id not in self.progress.fish_caught:
+                        fish_ids.add(fish_id)
+        return {opt_name: frozenset(fish_ids) for opt_name, fish_ids in gift_lists.items()}
+
+    def config(self, config: Config | ConfigSnapshot, game_data: typing.Mapping) -> ConfigSnapshot:
+        """`config` with the progress of the save, for the data file of the config."""
+        if isinstance(config, Config):
+            config = config.snapshot
+        bundles = dict(self._needed_bundles(game_data['fish']))
+        unlocked_areas = self.progress.locations_visited
+        return config.replace(
+            unlocked_areas=config.unlocked_areas if unlocked_areas is None else unlocked_areas,
+            fishing_level=self.progress.fishing_level,
+            bundles=frozenset(bundles),
+            bundle_contents=MappingProxyType({
+                Config._get_opt_name(en_name): needed
+                for en_name, needed in bundles.items()
+            }),
+            gift_lists=MappingProxyType(self._gift_lists(game_data)),
+        )
@@ -0,0 +1,82 @@
+import json
+import typing
+from collections import OrderedDict
+
+from recommend import FishFactors, FishRecommendationScoreCalculator
+
+
+class RecordSerializer:
+    """
+    Compact JSON of FishRecommendationScoreCalculator.output(), without building the dict.
+
+    Fields that do not depend on the day are encoded once per fish and reused,
+    so only score, factors and locations are encoded for every record.
+    They are kept for the MAX_SHAPES most recently serialized fish factors and retired factors,
+    and encoded again whenever either changes.
+    """
+
+    MAX_SHAPES = 4096
+
+    SCORE = 'Score'
+    FACTORS = 'Factors'
+    LOCATIONS = 'Locations'
+
+    DYNAMIC_FIELDS = (
+        SCORE,
+        FACTORS,
+        LOCATIONS,
+    )
+
+    def __init__(self, *, verbose: bool, fields: typing.Collection[str] = None):
+        self.verbose = verbose
+        self.fields = fields
+        self.encode: typing.Callable[[typing.Any], str] = json.JSONEncoder(
+            ensure_ascii=False,
+            separators=(',', ':'),
+        ).encode
+        self._keys: dict[str, str] = {}
+        # encoded field, or the name of a dynamic field
+        self._shapes: OrderedDict[tuple[FishFactors, tuple[str, ...]], list[tuple[bool, str]]] = OrderedDict()
+
+    def _key(self, key: str) -> str:
+        encoded = self._keys.get(key)
+        if encoded is None:
+            encoded = self._keys[key] = self.encode(key) + ':'
+        return encoded
+
+    def _shape(self, fish: FishRecommendationScoreCalculator) -> list[tuple[bool, str]]:
+        shape_key = fish._static, fish.retired_factors
+        shape = self._shapes.get(shape_key)
+        if shape is not None:
+            self._shapes.move_to_end(shape_key)
+            return shape
+
+        shape = self._shapes[shape_key] = [
+            (True, key) if key in self.DYNAMIC_FIELDS else (False, self._key(key) + self.encode(value))
+            for key, value in fish.output(verbose=self.verbose, fields=self.fields).items()
+        ]
+        if len(self._shapes) > self.MAX_SHAPES:
+            self._shapes.popitem(last=False)
+        return shape
+
+    def _dynamic(self, fish: FishRecommendationScoreCalculator, key: str) -> typing.Any:
+        if key == self.SCORE:
+            return fish.score
+        if key == self.FACTORS:
+            return fish.factors
+        if self.verbose:
+            return fish._output_locations_verbose
+        return fish._output_locations
+
+    def __call__(self, fish: FishRecommendationScoreCalculator, extra: dict = None) -> str:
+        """`extra` fields come before the fields of the fish."""
+        parts = []
+        if extra:
+            for key, value in extra.items():
+                parts.append(self._key(key) + self.encode(value))
+        for dynamic, field in self._shape(fish):
+            if dynamic:
+                parts.append(self._key(field) + self.encode(self._dynamic(fish, field)))
+            else:
+                parts.append(field)
+        return '{' + ','.join(parts) + '}'
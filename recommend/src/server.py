@@ -0,0 +1,339 @@
+import asyncio
+import glob
+import json
+import os
+import threading
+import traceback
+import typing
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from urllib.parse import urlsplit, parse_qs
+
+from returns import returns
+
+from cache import ResultCache
+from config import Config
+from recommend import RecommendationGenerator, FishRecommendationScoreCalculator, load_game_data, load_all_languages
+
+
+class BadRequest(Exception):
+    pass
+
+
+class NotFound(Exception):
+    pass
+
+
+class RecommendationService:
+    """
+    Keeps every language file and every config resident,
+    so that a request only costs the day-dependent part of the scoring.
+    """
+
+    INDEX_FILE = 'index.json'
+    CONFIG_EXT = '.conf'
+    DEFAULT_CONFIG = 'recommend'
+
+    TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+
+    def __init__(self, data_dir: str, config_dir: str, *, cache: ResultCache = None):
+        self.data_dir = data_dir
+        self.config_dir = config_dir
+        self.cache = cache
+        self._generators_lock = threading.Lock()
+
+    @cached_property
+    def _index(self) -> dict:
+        with open(os.path.join(self.data_dir, self.INDEX_FILE)) as f:
+            return json.load(f)
+
+    @cached_property
+    def _version(self) -> str:
+        return self._index['versions'][0]
+
+    @cached_property
+    def _all_game_data(self) -> list[typing.Mapping]:
+        return load_all_languages(self.data_dir, self._index, self._version)
+
+    @cached_property
+    @returns(dict)
+    def _languages(self) -> dict[str, typing.Mapping]:
+        """Language name or code -> game data"""
+        for game_data in self._all_game_data:
+            yield game_data['language'], game_data
+            if game_data['lang_code'] is not None:
+                yield game_data['lang_code'], game_data
+
+    @cached_property
+    @returns(dict)
+    def _configs(self) -> dict[str, Config]:
+        for config_file in sorted(glob.glob(os.path.join(self.config_dir, f'*{self.CONFIG_EXT}'))):
+            config_name = os.path.basename(config_file)[:-len(self.CONFIG_EXT)]
+            yield config_name, Config(config_file)
+
+    def _get_config(self, config_name: str) -> Config:
+        try:
+            return self._configs[config_name]
+        except KeyError:
+            raise NotFound(f'Unknown config: {config_name!r}')
+
+    def _get_game_data(self, config: Config, lang: str | None) -> typing.Mapping:
+        if lang is None:
+            return load_game_data(config.data_file, config.language)
+
+        try:
+            return self._languages[lang]
+        except KeyError:
+            raise NotFound(f'Unknown language: {lang!r}')
+
+    @cached_property
+    def _generators(self) -> dict[tuple[str, ...], RecommendationGenerator]:
+        """(config name, language code), or (config name,) for the language of the config -> generator"""
+        return {}
+
+    def _get_generator(self, config_name: str, lang: str | None) -> RecommendationGenerator:
+        config = self._get_config(config_name)
+        if lang is None:
+            key = config_name,
+            game_data = None
+        else:
+            game_data = self._get_game_data(config, lang)
+            # a language requested by name and by code shares one generator
+            key = config_name, game_data['lang_code']
+
+        with self._generators_lock:
+            if key not in self._generators:
+                if game_data is None:
+                    game_data = self._get_game_data(config, None)
+                # shared by every request for a day of the config and language
+                generator = RecommendationGenerator(config, game_data=game_data, cache=self.cache, prune=True)
+                for fish_factors in generator._fish_factors.values():
+                    _ = fish_factors.factors
+                self._generators[key] = generator
+            return self._generators[key]
+
+    def warm_up(self) -> None:
+        for config_name in self._configs:
+            self._get_generator(config_name, None)
+            for game_data in self._all_game_data:
+                self._get_generator(config_name, game_data['language'])
+
+    @staticmethod
+    def _get_choice(params: dict[str, str], name: str, choices: typing.Sequence[str]) -> str:
+        value = params.get(name)
+        if value not in choices:
+            raise BadRequest(f'{name} must be one of {", ".join(choices)}')
+        return value
+
+    @staticmethod
+    def _get_number(params: dict[str, str], name: str, type_: typing.Type[int | float]) -> int | float | None:
+        value = params.get(name)
+        if value is None:
+            return None
+        try:
+            return type_(value)
+        except ValueError:
+            raise BadRequest(f'{name} must be a number')
+
+    @staticmethod
+    def _get_fields(params: dict[str, str]) -> list[str] | None:
+        value = params.get('fields')
+        if value is None:
+            return None
+        fields = [field.strip() for field in value.split(',') if field.strip()]
+        if not fields:
+            raise BadRequest('fields needs at least one field')
+        for field in fields:
+            if field not in FishRecommendationScoreCalculator.FIELDS:
+                raise BadRequest(f'fields must be some of {", ".join(FishRecommendationScoreCalculator.FIELDS)}')
+        return fields
+
+    @returns(list)
+    def recommend(self, params: dict[str, str]) -> list[dict]:
+        season = self._get_choice(params, 'season', RecommendationGenerator.SEASONS)
+        weather = self._get_choice(params, 'weather', RecommendationGenerator.WEATHERS)
+        top = self._get_number(params, 'top', int)
+        min_score = self._get_number(params, 'min_score', float)
+        verbose = params.get('verbose', '').lower() in self.TRUE_VALUES
+        fields = self._get_fields(params)
+
+        generator = self._get_generator(params.get('config', self.DEFAULT_CONFIG), params.get('lang'))
+        for fish in generator.for_day(season, weather).get(top=top, min_score=min_score):
+            yield fish.output(verbose=verbose, fields=fields)
+
+    def stats(self, params: dict[str, str]) -> dict:
+        if self.cache is None:
+            return {}
+        return {'cache': self.cache.stats}
+
+
+class HTTPServer:
+    PATH = '/recommend'
+    STATS_PATH = '/stats'
+
+    REASONS = {
+        200: 'OK',
+        400: 'Bad Request',
+        404: 'Not Found',
+        405: 'Method Not Allowed',
+        500: 'Internal Server Error',
+    }
+
+    # bodies are not used by any endpoint, and are read and dropped up to this size to keep the connection
+    MAX_BODY_BYTES = 64 * 1024
+
+    def __init__(self, service: RecommendationService, *, workers: int, backlog: int):
+        self.service = service
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        # requests waiting for or running on a worker; others wait on the socket
+        self._slots = asyncio.Semaphore(workers + backlog)
+
+    def _response(self, status: int, body: dict | list, keep_alive: bool) -> bytes:
+        body = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode()
+        headers = (
+            f'HTTP/1.1 {status} {self.REASONS[status]}\r\n'
+            f'Content-Type: application/json; charset=utf-8\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+            f'\r\n'
+        )
+        return headers.encode() + body
+
+    async def _handle(self, method: str, target: str) -> tuple[int, dict | list]:
+        if method != 'GET':
+            return 405, {'error': f'Method not allowed: {method}'}
+
+        url = urlsplit(target)
+        if url.path == self.PATH:
+            handler = self.service.recommend
+        elif url.path == self.STATS_PATH:
+            handler = self.service.stats
+        else:
+            return 404, {'error': f'Not found: {url.path}'}
+
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            try:
+                return 200, await loop.run_in_executor(self._executor, handler, params)
+            except BadRequest as e:
+                return 400, {'error': str(e)}
+            except NotFound as e:
+                return 404, {'error': str(e)}
+
+    @staticmethod
+    async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+        headers = {}
+        while True:
+            line = await reader.readline()
+            line = line.decode('latin-1').strip()
+            if not line:
+                return headers
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    @classmethod
+    async def _skip_body(cls, reader: asyncio.StreamReader, headers: dict[str, str]) -> bool:
+        """
+        Reads and drops the body of a request.
+        False if where the body ends is unknown, or it is too large, and the connection has to be closed.
+        """
+        if 'transfer-encoding' in headers:
+            return False
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            return False
+        if not 0 <= length <= cls.MAX_BODY_BYTES:
+            return False
+        await reader.readexactly(length)
+        return True
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    writer.write(self._response(400, {'error': 'Malformed request line'}, False))
+                    break
+
+                headers = await self._read_headers(reader)
+                connection = headers.get('connection', '').lower()
+                if version == 'HTTP/1.0':
+                    keep_alive = connection == 'keep-alive'
+                else:
+                    keep_alive = connection != 'close'
+                if not await self._skip_body(reader, headers):
+                    keep_alive = False
+
+                try:
+                    status, body = await self._handle(method, target)
+                except Exception:
+                    traceback.print_exc()
+                    status, body = 500, {'error': self.REASONS[500]}
+                writer.write(self._response(status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self._serve_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(args=None):
+    parser = ArgumentParser()
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument(
+        '--data-dir', default='/data',
+        help="Directory containing index.json and the language files. Default: '/data'",
+    )
+    parser.add_argument(
+        '--config-dir', default='../config',
+        help="Every *.conf in this directory can be selected with ?config=<name>. Default: '../config'",
+    )
+    parser.add_argument(
+        '--workers', type=int, default=os.cpu_count(),
+        help='Number of scoring workers. Default: number of CPUs',
+    )
+    parser.add_argument(
+        '--backlog', type=int, default=256,
+        help='Number of requests that may wait for a free worker. Default: 256',
+    )
+    parser.add_argument(
+        '--cache-size', type=int, default=64,
+        help='Size of the in-memory result cache in MiB. 0 disables the cache. Default: 64',
+    )
+    parser.add_argument(
+        '--cache-dir', default=None,
+        help='Also keep cached results in this directory, so that they survive restarts. Default: memory only',
+    )
+    args = parser.parse_args(args)
+
+    cache = None
+    if args.cache_size > 0:
+        cache = ResultCache(
+            os.path.join(args.data_dir, RecommendationService.INDEX_FILE),
+            max_bytes=args.cache_size * 1024 * 1024,
+            directory=args.cache_dir,
+        )
+    service = RecommendationService(args.data_dir, args.config_dir, cache=cache)
+    service.warm_up()
+    server = HTTPServer(service, workers=args.workers, backlog=args.backlog)
+    print(f'Serving on http://{args.host}:{args.port}{HTTPServer.PATH}', flush=True)
+    asyncio.run(server.serve(args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
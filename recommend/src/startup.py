@@ -0,0 +1,134 @@
+"""
+Startup of the command line: a cache of parsed inputs, and measurements against a budget.
+
+The cache keeps the snapshot of a config file and the decoded JSON of a data file,
+and reuses them as long as the modification time and size of the file are unchanged.
+Entries are written with marshal, which is built into the interpreter and decodes faster than JSON.
+"""
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+import time
+import typing
+from types import MappingProxyType
+
+from config import Config, ConfigSnapshot
+
+# ms of a `main.py {season} {weather}` run, for data files of the game's size:
+# the best runs of the code before the start-up work (see benchmarks.startup --baseline), which must not get slower
+BUDGET_MS = {
+    'interpreter': 15,
+    'imports': 32,
+    'parser': 2,
+    'config': 2,
+    'data': 3,
+    'recommend': 3,
+    'output': 2,
+    'total': 60,
+}
+
+
+class StartupCache:
+    FORMAT_VERSION = 1
+    EXT = 'marshal'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def _stamp(path: str) -> tuple[int, int, int, int]:
+        stat = os.stat(path)
+        return StartupCache.FORMAT_VERSION, sys.hexversion, stat.st_mtime_ns, stat.st_size
+
+    def _path(self, kind: str, path: str) -> str:
+        digest = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f'{kind}-{digest}.{self.EXT}')
+
+    def get(self, kind: str, path: str, compute: typing.Callable[[], typing.Any]):
+        """The cached value for `path` if the file is unchanged, otherwise `compute()`, which gets cached."""
+        stamp = self._stamp(path)
+        cache_path = self._path(kind, path)
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_stamp, value = marshal.loads(f.read())
+        except (FileNotFoundError, EOFError, ValueError, TypeError):
+            pass
+        else:
+            if cached_stamp == stamp:
+                return value
+
+        value = compute()
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(marshal.dumps((stamp, value)))
+        os.replace(tmp_path, cache_path)
+        return value
+
+    @staticmethod
+    def _dump_config(config: ConfigSnapshot) -> dict:
+        return {
+            name: dict(value) if isinstance(value, typing.Mapping) else value
+            for name, value in config.asdict().items()
+        }
+
+    def config(self, config_file: str) -> ConfigSnapshot:
+        values = self.get('config', config_file, lambda: self._dump_config(Config(config_file).snapshot))
+        return ConfigSnapshot(**{
+            name: MappingProxyType(value) if isinstance(value, dict) else value
+            for name, value in values.items()
+        })
+
+    def json(self, data_file: str) -> typing.Any:
+        def load():
+            with open(data_file) as f:
+                return json.load(f)
+
+        return self.get('data', data_file, load)
+
+
+def wall_times(args: list[str], repeat: int, env: typing.Mapping[str, str] = None) -> list[float]:
+    """Seconds of every run of the interpreter with `args`, output discarded."""
+    import subprocess
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, env=env, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+class ImportTime(typing.NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def import_times(args: list[str]) -> list[ImportTime]:
+    """
+    Modules imported directly by a run of the interpreter with `args`, in order, from `-X importtime`.
+    Modules that the interpreter imports at startup are left out.
+    """
+    import subprocess
+
+    def top_level(run_args: list[str]) -> list[ImportTime]:
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', *run_args],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+        )
+        result = []
+        for line in process.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match is None or match.group(3):
+                continue
+            result.append(ImportTime(match.group(4), int(match.group(1)), int(match.group(2))))
+        return result
+
+    interpreter = {item.module for item in top_level(['-c', 'pass'])}
+    return [item for item in top_level(args) if item.module not in interpreter]